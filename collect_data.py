@@ -3,7 +3,7 @@
 
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -26,6 +26,10 @@ def collect_once():
         success_count = 0
         error_count = 0
         
+        # Accumulate rows and insert them in a single statement after the loop
+        rows = []
+        timestamp = datetime.now(timezone.utc)
+        
         for sensor in sensors:
             try:
                 # Create sensor instance
@@ -70,20 +74,18 @@ def collect_once():
                         ir_level = data.get('ir_level')
                         reading_data = data
                     
-                    # Store in database
-                    reading = SensorReading(
-                        sensor_id=sensor.id,
-                        sensor_type=sensor.sensor_type,
-                        temperature=temperature,
-                        humidity=humidity,
-                        pressure=pressure,
-                        light_level=light_level,
-                        ir_level=ir_level,
-                        data=reading_data,  # Store all data in JSON field
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    db.session.add(reading)
+                    # Queue for database insert
+                    rows.append({
+                        'sensor_id': sensor.id,
+                        'sensor_type': sensor.sensor_type,
+                        'temperature': temperature,
+                        'humidity': humidity,
+                        'pressure': pressure,
+                        'light_level': light_level,
+                        'ir_level': ir_level,
+                        'data': reading_data,  # Store all data in JSON field
+                        'timestamp': timestamp
+                    })
                     success_count += 1
                 else:
                     print(f"❌ {sensor.id}: Read error - {data}")
@@ -94,6 +96,8 @@ def collect_once():
                 error_count += 1
         
         try:
+            if rows:
+                db.session.execute(SensorReading.__table__.insert(), rows)
             db.session.commit()
             print(f"✅ Data saved to database: {success_count} success, {error_count} errors")
         except Exception as e:
@@ -1,162 +1,438 @@
 #!/usr/bin/env python3
 """Data collection service for storing periodic sensor readings."""
 
+import asyncio
+import signal
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
 
 from sensor_hub import create_app
 from sensor_hub.models import Sensor, SensorReading, db
 from sensor_hub.sensor_registry import SensorRegistry
+from sensor_hub.sensors import SensorInterface
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent sensor reads per collection pass
+MAX_READ_WORKERS = 16
+
+# How long the resolved sensor inventory is reused before re-querying (seconds)
+SENSOR_CACHE_TTL = 300
+
+
+def _reading_row(sensor_id: str, sensor_type: str, timestamp: datetime) -> Dict[str, Any]:
+    """Build a sensor_readings row with every column present.
+
+    A multi-row INSERT requires each parameter set to share the same keys.
+    """
+    return {
+        'sensor_id': sensor_id,
+        'sensor_type': sensor_type,
+        'timestamp': timestamp,
+        'temperature': None,
+        'humidity': None,
+        'pressure': None,
+        'light_level': None,
+        'ir_level': None,
+        'proximity': None,
+        'data': None,
+        'status': 'active',
+        'error_message': None
+    }
+
+
+def _map_default(reading_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Generic handling for other sensor types: keep the raw reading."""
+    return {'data': reading_data}
+
+
+def _map_bme280(reading_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a BME280 reading (nested under 'data') to reading columns."""
+    if 'data' not in reading_data:
+        return _map_default(reading_data)
+    data = reading_data['data']
+    return {
+        'temperature': data.get('temperature'),
+        'humidity': data.get('humidity'),
+        'pressure': data.get('pressure'),
+        'data': data
+    }
+
+
+def _map_ltr329(reading_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an LTR-329 reading to reading columns."""
+    return {
+        'light_level': reading_data.get('light_level'),
+        'ir_level': reading_data.get('ir_level'),
+        'data': reading_data
+    }
+
+
+def _map_mpu6050(reading_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an MPU-6050 reading to reading columns."""
+    return {
+        'temperature': reading_data.get('temperature'),
+        'data': {
+            'accel_x': reading_data.get('accel_x'),
+            'accel_y': reading_data.get('accel_y'),
+            'accel_z': reading_data.get('accel_z'),
+            'gyro_x': reading_data.get('gyro_x'),
+            'gyro_y': reading_data.get('gyro_y'),
+            'gyro_z': reading_data.get('gyro_z'),
+            'temperature': reading_data.get('temperature')
+        }
+    }
+
+
+# Smallest change per field that counts as a new value when skipping
+# unchanged readings; fields not listed must match exactly
+CHANGE_EPSILONS = {
+    'temperature': 0.05,
+    'humidity': 0.5,
+    'pressure': 0.1,
+    'dew_point': 0.05,
+    'light_level': 1.0,
+    'ir_level': 1.0,
+}
+
+# Reading fields ignored when comparing against the last stored reading
+CHANGE_IGNORED_FIELDS = frozenset({'timestamp'})
+
+
+def _reading_changed(previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    """Check whether any reading field moved by more than its epsilon."""
+    if previous.keys() != current.keys():
+        return True
+    
+    for key, value in current.items():
+        if key in CHANGE_IGNORED_FIELDS:
+            continue
+        last = previous[key]
+        if isinstance(value, (int, float)) and isinstance(last, (int, float)):
+            if abs(value - last) > CHANGE_EPSILONS.get(key, 0):
+                return True
+        elif value != last:
+            return True
+    return False
+
+
+# Sensor type -> function mapping a raw reading to sensor_readings columns
+SENSOR_TYPE_MAPPERS = {
+    'bme280': _map_bme280,
+    'ltr329': _map_ltr329,
+    'mpu6050': _map_mpu6050,
+}
+
 
 class DataCollectionService:
     """Service for periodically collecting and storing sensor data."""
     
-    def __init__(self, interval_seconds: int = 60):
+    def __init__(self, interval_seconds: int = 60, commit_every: int = 1,
+                 max_quiet_interval: Optional[int] = None):
         """Initialize data collection service.
         
         Args:
             interval_seconds: How often to collect data (default: 60 seconds)
+            commit_every: Number of collection cycles to buffer before writing
+                them in one transaction (default: 1). Up to commit_every - 1
+                cycles of readings are lost if the process dies uncleanly.
+            max_quiet_interval: When set, readings that have not changed beyond
+                CHANGE_EPSILONS are skipped, but a reading is still stored at
+                least this often (seconds). None stores every reading.
         """
         self.interval = interval_seconds
+        self.commit_every = max(1, commit_every)
+        self._cycle_count = 0
+        self._pending_rows: List[Dict[str, Any]] = []
+        self.max_quiet_interval = max_quiet_interval
+        # sensor_id -> (timestamp, data) of the last reading queued for storage
+        self._last_persisted: Dict[str, Tuple[datetime, Dict[str, Any]]] = {}
         self.registry = SensorRegistry()
         self.running = False
+        # One lock per I2C bus; multiplexed sensors must not interleave
+        # channel selection and register reads on a shared bus.
+        self._bus_locks: Dict[int, threading.Lock] = {}
+        self._sensor_cache: List[Tuple[str, str, Any, Dict[str, Any], threading.Lock]] = []
+        self._sensor_cache_ts: Optional[float] = None
+        # Driver instances are built on first use and reused across passes
+        self._instances: Dict[str, SensorInterface] = {}
+    
+    def invalidate(self, sensor_id: Optional[str] = None) -> None:
+        """Reload sensor configuration on the next collection.
+        
+        Args:
+            sensor_id: Sensor whose driver instance should be rebuilt, or
+                None to rebuild all of them
+        """
+        if sensor_id is None:
+            self._instances.clear()
+        else:
+            self._instances.pop(sensor_id, None)
+        self._sensor_cache_ts = None
+    
+    def _get_sensor_jobs(self) -> List[Tuple[str, str, Any, Dict[str, Any], threading.Lock]]:
+        """Return the resolved sensor inventory, reloading it once the TTL expires.
+        
+        Each entry is ``(sensor_id, sensor_type, sensor_class, config, bus_lock)``.
+        Plain values are cached rather than ORM objects so the entries stay
+        valid across commits and can be handed to worker threads.
+        """
+        now = time.monotonic()
+        if (self._sensor_cache_ts is not None
+                and now - self._sensor_cache_ts < SENSOR_CACHE_TTL):
+            return self._sensor_cache
+        
+        previous_configs = {job[0]: job[3] for job in self._sensor_cache}
+        jobs = []
+        for sensor in Sensor.query.all():
+            # Build sensor configuration
+            config = {'i2c_address': sensor.i2c_address}
+            if sensor.calibration_data:
+                config.update(sensor.calibration_data)
+            
+            sensor_class = self.registry.get_sensor_class(sensor.sensor_type)
+            if not sensor_class:
+                logger.warning(f"No sensor class found for {sensor.sensor_type}")
+                continue
+            
+            # Rebuild the driver if its configuration changed
+            if previous_configs.get(sensor.id, config) != config:
+                self._instances.pop(sensor.id, None)
+            
+            bus_number = sensor.bus_number or 1
+            bus_lock = self._bus_locks.setdefault(bus_number, threading.Lock())
+            jobs.append((sensor.id, sensor.sensor_type, sensor_class, config, bus_lock))
+        
+        # Drop drivers for sensors that are no longer registered
+        current_ids = {job[0] for job in jobs}
+        for stale_id in set(self._instances) - current_ids:
+            del self._instances[stale_id]
+        
+        self._sensor_cache = jobs
+        self._sensor_cache_ts = now
+        return jobs
+    
+    def _read_one(self, sensor_id: str, sensor_class, config: Dict[str, Any],
+                  bus_lock: threading.Lock) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+        """Take a reading, creating the sensor instance on first use.
+        
+        Runs on a worker thread. A sensor that fails to read is dropped from
+        the instance cache so the driver is re-initialised next pass.
+        """
+        try:
+            with bus_lock:
+                sensor_instance = self._instances.get(sensor_id)
+                if sensor_instance is None:
+                    sensor_instance = sensor_class(sensor_id, config)
+                    self._instances[sensor_id] = sensor_instance
+                reading_data = sensor_instance.read()
+        except Exception as e:
+            self._instances.pop(sensor_id, None)
+            return None, e
+        
+        if not reading_data or 'error' in reading_data:
+            self._instances.pop(sensor_id, None)
+        return reading_data, None
     
     def collect_sensor_data(self) -> Dict[str, Any]:
         """Collect data from all sensors and store in database."""
-        sensors = Sensor.query.all()
+        jobs = self._get_sensor_jobs()
+        timestamp = datetime.now(timezone.utc)
+        
+        # Read all sensors concurrently, overlapping I2C wait time
+        read_results = []
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(jobs))) as executor:
+                futures = [
+                    executor.submit(self._read_one, sensor_id, sensor_class, config, bus_lock)
+                    for sensor_id, _, sensor_class, config, bus_lock in jobs
+                ]
+                read_results = [future.result() for future in futures]
+        
+        return self._store_readings(jobs, read_results, timestamp)
+    
+    async def collect_sensor_data_async(self) -> Dict[str, Any]:
+        """Collect data from all sensors without blocking the event loop."""
+        jobs = self._get_sensor_jobs()
+        timestamp = datetime.now(timezone.utc)
+        
+        # Blocking I2C reads run in the default executor; database work
+        # stays on the event loop thread, which owns the app context.
+        read_results = await asyncio.gather(*(
+            asyncio.to_thread(self._read_one, sensor_id, sensor_class, config, bus_lock)
+            for sensor_id, _, sensor_class, config, bus_lock in jobs
+        ))
+        
+        return self._store_readings(jobs, read_results, timestamp)
+    
+    def _store_readings(self, jobs, read_results, timestamp: datetime) -> Dict[str, Any]:
+        """Convert read results to rows and store them in the database."""
         results = {
             'success_count': 0,
             'error_count': 0,
             'sensors': []
         }
         
-        for sensor in sensors:
+        # Accumulate rows and insert them in a single statement after the loop
+        rows = []
+        
+        for (sensor_id, sensor_type, _, _, _), (reading_data, read_error) in zip(jobs, read_results):
             try:
-                # Build sensor configuration
-                config = {'i2c_address': sensor.i2c_address}
-                if sensor.calibration_data:
-                    config.update(sensor.calibration_data)
-                
-                # Create sensor instance and take reading
-                sensor_class = self.registry.get_sensor_class(sensor.sensor_type)
-                if not sensor_class:
-                    logger.warning(f"No sensor class found for {sensor.sensor_type}")
-                    continue
-                
-                sensor_instance = sensor_class(sensor.id, config)
-                reading_data = sensor_instance.read()
+                if read_error is not None:
+                    raise read_error
                 
                 if reading_data and 'error' not in reading_data:
                     # Store reading in database
-                    reading = SensorReading(
-                        sensor_id=sensor.id,
-                        sensor_type=sensor.sensor_type,
-                        timestamp=datetime.now(timezone.utc)
-                    )
+                    row = _reading_row(sensor_id, sensor_type, timestamp)
                     
                     # Map sensor-specific data to database fields
-                    if sensor.sensor_type == 'bme280' and 'data' in reading_data:
-                        data = reading_data['data']
-                        reading.temperature = data.get('temperature')
-                        reading.humidity = data.get('humidity')
-                        reading.pressure = data.get('pressure')
-                        reading.data = data
-                    
-                    elif sensor.sensor_type == 'ltr329':
-                        reading.light_level = reading_data.get('light_level')
-                        reading.ir_level = reading_data.get('ir_level')
-                        reading.data = reading_data
-                    
-                    elif sensor.sensor_type == 'mpu6050':
-                        reading.temperature = reading_data.get('temperature')
-                        reading.data = {
-                            'accel_x': reading_data.get('accel_x'),
-                            'accel_y': reading_data.get('accel_y'),
-                            'accel_z': reading_data.get('accel_z'),
-                            'gyro_x': reading_data.get('gyro_x'),
-                            'gyro_y': reading_data.get('gyro_y'),
-                            'gyro_z': reading_data.get('gyro_z'),
-                            'temperature': reading_data.get('temperature')
-                        }
-                    
-                    else:
-                        # Generic handling for other sensor types
-                        reading.data = reading_data
+                    mapper = SENSOR_TYPE_MAPPERS.get(sensor_type, _map_default)
+                    row.update(mapper(reading_data))
                     
-                    reading.status = 'active'
-                    db.session.add(reading)
+                    stored = self._should_store(sensor_id, row, timestamp)
+                    if stored:
+                        rows.append(row)
                     
                     results['success_count'] += 1
                     results['sensors'].append({
-                        'sensor_id': sensor.id,
+                        'sensor_id': sensor_id,
                         'status': 'success',
+                        'stored': stored,
                         'reading': reading_data
                     })
                     
-                    logger.debug(f"Stored reading for {sensor.id}")
+                    if stored:
+                        logger.debug(f"Stored reading for {sensor_id}")
+                    else:
+                        logger.debug(f"Skipped unchanged reading for {sensor_id}")
                 
                 else:
                     # Store error reading
                     error_msg = reading_data.get('error', 'Unknown error') if reading_data else 'No data'
-                    reading = SensorReading(
-                        sensor_id=sensor.id,
-                        sensor_type=sensor.sensor_type,
-                        timestamp=datetime.now(timezone.utc),
-                        status='error',
-                        error_message=error_msg
-                    )
-                    db.session.add(reading)
+                    row = _reading_row(sensor_id, sensor_type, timestamp)
+                    row['status'] = 'error'
+                    row['error_message'] = error_msg
+                    rows.append(row)
                     
                     results['error_count'] += 1
                     results['sensors'].append({
-                        'sensor_id': sensor.id,
+                        'sensor_id': sensor_id,
                         'status': 'error',
                         'error': error_msg
                     })
                     
-                    logger.warning(f"Error reading sensor {sensor.id}: {error_msg}")
+                    logger.warning(f"Error reading sensor {sensor_id}: {error_msg}")
             
             except Exception as e:
-                logger.error(f"Exception collecting data from {sensor.id}: {e}")
+                logger.error(f"Exception collecting data from {sensor_id}: {e}")
                 results['error_count'] += 1
                 results['sensors'].append({
-                    'sensor_id': sensor.id,
+                    'sensor_id': sensor_id,
                     'status': 'exception',
                     'error': str(e)
                 })
         
-        # Commit all readings at once
+        # Buffer rows and write them once every commit_every cycles
+        self._pending_rows.extend(rows)
+        self._cycle_count += 1
+        if self._cycle_count % self.commit_every == 0:
+            self.flush()
+        
+        logger.info(f"Data collection complete: {results['success_count']} success, {results['error_count']} errors")
+        return results
+    
+    def _should_store(self, sensor_id: str, row: Dict[str, Any],
+                      timestamp: datetime) -> bool:
+        """Decide whether a successful reading needs to be written."""
+        if self.max_quiet_interval is None:
+            return True
+        
+        data = row['data'] or {}
+        last = self._last_persisted.get(sensor_id)
+        if (last is not None
+                and (timestamp - last[0]).total_seconds() < self.max_quiet_interval
+                and not _reading_changed(last[1], data)):
+            return False
+        
+        self._last_persisted[sensor_id] = (timestamp, data)
+        return True
+    
+    def flush(self) -> None:
+        """Insert all buffered readings in one statement and commit."""
+        if not self._pending_rows:
+            return
+        
+        stored = len(self._pending_rows)
         try:
+            try:
+                db.session.execute(SensorReading.__table__.insert(), self._pending_rows)
+            except IntegrityError as e:
+                # One bad row fails the whole statement; keep the good ones
+                logger.warning(f"Batch insert rejected ({e.orig}), "
+                               f"retrying {len(self._pending_rows)} readings individually")
+                db.session.rollback()
+                stored = self._insert_isolated(self._pending_rows)
             db.session.commit()
-            logger.info(f"Data collection complete: {results['success_count']} success, {results['error_count']} errors")
         except Exception as e:
-            logger.error(f"Database commit failed: {e}")
+            # Keep the buffer so the next flush retries these readings
+            logger.error(f"Database commit failed, keeping "
+                         f"{len(self._pending_rows)} buffered readings: {e}")
             db.session.rollback()
             raise
         
-        return results
+        self._pending_rows = []
+        logger.debug(f"Committed {stored} buffered readings")
     
-    def run_continuous(self):
-        """Run continuous data collection."""
-        logger.info(f"Starting data collection service (interval: {self.interval}s)")
-        self.running = True
+    def _insert_isolated(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows one at a time, each under its own SAVEPOINT.
         
-        while self.running:
+        Returns:
+            Number of rows inserted
+        """
+        insert = SensorReading.__table__.insert()
+        stored = 0
+        for row in rows:
             try:
-                self.collect_sensor_data()
-                time.sleep(self.interval)
-            except KeyboardInterrupt:
-                logger.info("Data collection stopped by user")
-                self.running = False
-                break
-            except Exception as e:
-                logger.error(f"Data collection error: {e}")
-                time.sleep(5)  # Short delay before retry
+                with db.session.begin_nested():
+                    db.session.execute(insert, row)
+                stored += 1
+            except IntegrityError as e:
+                logger.error(f"Dropping reading for sensor {row['sensor_id']}: {e.orig}")
+        return stored
+    
+    async def run_continuous(self):
+        """Run continuous data collection on the asyncio event loop."""
+        logger.info(f"Starting data collection service (interval: {self.interval}s, "
+                    f"commit every {self.commit_every} cycles)")
+        self.running = True
+        
+        # Treat SIGTERM like Ctrl+C so buffered readings are flushed
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass
+        
+        try:
+            while self.running:
+                try:
+                    await self.collect_sensor_data_async()
+                    await asyncio.sleep(self.interval)
+                except asyncio.CancelledError:
+                    logger.info("Data collection stopped")
+                    self.running = False
+                    raise
+                except Exception as e:
+                    logger.error(f"Data collection error: {e}")
+                    await asyncio.sleep(5)  # Short delay before retry
+        finally:
+            self.flush()
     
     def stop(self):
         """Stop the data collection service."""
@@ -170,6 +446,11 @@ def main():
     parser = argparse.ArgumentParser(description='Sensor Hub Data Collection Service')
     parser.add_argument('--interval', type=int, default=60,
                        help='Collection interval in seconds (default: 60)')
+    parser.add_argument('--commit-every', type=int, default=1,
+                       help='Collection cycles to buffer per database commit (default: 1)')
+    parser.add_argument('--max-quiet-interval', type=int, default=None,
+                       help='Skip unchanged readings, storing one at least this '
+                            'often in seconds (default: store every reading)')
     parser.add_argument('--once', action='store_true',
                        help='Collect data once and exit')
     parser.add_argument('--verbose', action='store_true',
@@ -189,11 +470,16 @@ def main():
     app = create_app()
     
     with app.app_context():
-        service = DataCollectionService(interval_seconds=args.interval)
+        service = DataCollectionService(
+            interval_seconds=args.interval,
+            commit_every=args.commit_every,
+            max_quiet_interval=args.max_quiet_interval
+        )
         
         if args.once:
             print("Collecting sensor data once...")
             results = service.collect_sensor_data()
+            service.flush()
             print(f"Results: {results['success_count']} successful, {results['error_count']} errors")
             
             for sensor_result in results['sensors']:
@@ -201,8 +487,9 @@ def main():
                 print(f"  {status_emoji} {sensor_result['sensor_id']}: {sensor_result['status']}")
         else:
             try:
-                service.run_continuous()
-            except KeyboardInterrupt:
+                asyncio.run(service.run_continuous())
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                # SIGTERM cancels the collection task; both are clean stops
                 print("\nData collection service stopped.")
 
 
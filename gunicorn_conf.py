@@ -0,0 +1,25 @@
+"""Gunicorn settings for serving the Sensor Hub web application.
+
+Usage:
+    poetry run gunicorn -c gunicorn_conf.py sensor_hub.app:app
+"""
+
+import os
+
+bind = os.environ.get('SENSOR_HUB_BIND', '0.0.0.0:5001')
+
+# One process with a thread pool: live sensor reads block in C I2C calls
+# that release the GIL, so threads overlap them, while the per-bus locks
+# and cached driver instances in sensor_hub.poller stay shared by every
+# request. Extra worker processes would each open the buses independently.
+worker_class = 'gthread'
+workers = int(os.environ.get('SENSOR_HUB_WORKERS', '1'))
+threads = int(os.environ.get('SENSOR_HUB_THREADS', '8'))
+
+# Dashboard requests wait on sensor reads; leave room for a slow bus
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
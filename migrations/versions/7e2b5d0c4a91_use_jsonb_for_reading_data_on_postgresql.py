@@ -0,0 +1,40 @@
+"""Use JSONB for sensor_readings.data on PostgreSQL
+
+Revision ID: 7e2b5d0c4a91
+Revises: 3c1f8a2d9b47
+Create Date: 2026-10-15 10:03:27.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7e2b5d0c4a91'
+down_revision = '3c1f8a2d9b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # JSON and JSONB are the same type on other backends
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.alter_column('sensor_readings', 'data',
+                    type_=postgresql.JSONB(),
+                    existing_type=sa.JSON(),
+                    existing_nullable=True,
+                    postgresql_using='data::jsonb')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.alter_column('sensor_readings', 'data',
+                    type_=sa.JSON(),
+                    existing_type=postgresql.JSONB(),
+                    existing_nullable=True,
+                    postgresql_using='data::json')
@@ -0,0 +1,51 @@
+"""Use database-side defaults for row timestamps
+
+Revision ID: b91c4e7d2a60
+Revises: a4d7e1f3c852
+Create Date: 2026-10-15 23:02:14.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b91c4e7d2a60'
+down_revision = 'a4d7e1f3c852'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs whose default moves from Python to the database
+TIMESTAMP_COLUMNS = (
+    ('sensor_readings', 'timestamp'),
+    ('sensors', 'created_at'),
+    ('sensors', 'updated_at'),
+    ('system_status', 'timestamp'),
+)
+
+
+def _utcnow():
+    """Dialect-specific SQL for the current UTC time, matching models.utcnow."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)")
+    if dialect == 'sqlite':
+        return sa.text("(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))")
+    return sa.text('CURRENT_TIMESTAMP')
+
+
+def upgrade():
+    default = _utcnow()
+    for table, column in TIMESTAMP_COLUMNS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column,
+                                  existing_type=sa.DateTime(),
+                                  server_default=default)
+
+
+def downgrade():
+    for table, column in TIMESTAMP_COLUMNS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column,
+                                  existing_type=sa.DateTime(),
+                                  server_default=None)
@@ -0,0 +1,52 @@
+"""Pad SQLite timestamp defaults to microseconds
+
+Revision ID: d5a8f2c6e193
+Revises: b91c4e7d2a60
+Create Date: 2026-10-15 23:41:07.522913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a8f2c6e193'
+down_revision = 'b91c4e7d2a60'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs filled in by the database-side default
+TIMESTAMP_COLUMNS = (
+    ('sensor_readings', 'timestamp'),
+    ('sensors', 'created_at'),
+    ('sensors', 'updated_at'),
+    ('system_status', 'timestamp'),
+)
+
+
+def _set_default(sql):
+    for table, column in TIMESTAMP_COLUMNS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column,
+                                  existing_type=sa.DateTime(),
+                                  server_default=sa.text(sql))
+
+
+def upgrade():
+    # SQLAlchemy stores SQLite DATETIME text with six fractional digits and
+    # compares it as text; the previous default wrote only three
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    _set_default("(STRFTIME('%Y-%m-%d %H:%M:%f', 'now') || '000')")
+    for table, column in TIMESTAMP_COLUMNS:
+        op.execute(f"UPDATE {table} SET {column} = {column} || '000' "
+                   f"WHERE length({column}) = 23")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # Padded values stay valid under the millisecond default
+    _set_default("(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))")
@@ -1,7 +1,7 @@
 """Sensor Hub Flask Application."""
 
 from flask import Flask
-from flask_cors import CORS
+from jinja2 import FileSystemBytecodeCache
 
 from sensor_hub.database import db, migrate
 from sensor_hub.config import Config
@@ -21,13 +21,29 @@ def create_app(config_class=Config):
         enable_colors=not app.config.get('TESTING', False)
     )
 
+    # Import models so they are registered with SQLAlchemy; deferred to here
+    # so that importing the package alone stays cheap for scripts and CLI
+    from sensor_hub import models  # noqa: F401
+    from flask_cors import CORS
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
     CORS(app)
 
-    # Register blueprints
-    from sensor_hub.routes import main_bp
+    # Cache compiled templates on disk
+    if app.config.get('JINJA_BYTECODE_CACHE'):
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+            app.config.get('JINJA_CACHE_DIR')
+        )
+
+    # Live dashboard readings
+    from sensor_hub.poller import live_poller
+    live_poller.init_app(app)
+
+    # Register blueprints; the page caches are invalidated on commits
+    from sensor_hub.routes import init_cache_invalidation, main_bp
+    init_cache_invalidation()
     from sensor_hub.api import api_bp
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp)
@@ -47,7 +63,3 @@ def create_app(config_class=Config):
     app.cli.add_command(start_scheduler_command)
 
     return app
-
-
-# Import models to ensure they're registered with SQLAlchemy
-from sensor_hub import models  # noqa: F401, E402
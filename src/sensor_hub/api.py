@@ -2,26 +2,55 @@
 
 from flask import Blueprint, jsonify, request
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import logging
 
+from sqlalchemy import func, select
+
+from sensor_hub.cache import ttl_cache
 from sensor_hub.database import db
 from sensor_hub.models import SensorReading, Sensor, SystemStatus
+from sensor_hub.query_params import IntParam, parse_int_params
+from sensor_hub.serialization import (
+    STREAM_CHUNK_SIZE, conditional_response, json_response, make_etag,
+    stream_list_response
+)
 
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+# Seconds a computed /api/status payload is reused between requests
+STATUS_CACHE_TTL = 5
+
+# Query parameters for the reading list endpoints
+SENSOR_READINGS_PARAMS = {
+    'hours': IntParam(default=24, minimum=1, maximum=168),  # Max 1 week
+    'limit': IntParam(default=1000, minimum=1, maximum=10000),
+}
+ALL_READINGS_PARAMS = {
+    'hours': IntParam(default=1, minimum=1, maximum=24),
+    'limit': IntParam(default=100, minimum=1, maximum=1000),
+}
+
 
 @api_bp.route('/sensors', methods=['GET'])
 def get_sensors():
     """Get all registered sensors."""
     try:
-        sensors = Sensor.query.all()
-        return jsonify({
-            'sensors': [sensor.to_dict() for sensor in sensors],
-            'status': 'success'
-        })
+        # Any insert, update or delete moves the row count or latest update
+        count, last_updated = db.session.query(
+            func.count(Sensor.id), func.max(Sensor.updated_at)
+        ).one()
+        
+        def build():
+            sensors = Sensor.query.all()
+            return jsonify({
+                'sensors': [sensor.to_dict() for sensor in sensors],
+                'status': 'success'
+            })
+        
+        return conditional_response(make_etag(count, last_updated), build)
     except Exception as e:
         logger.error(f"Error fetching sensors: {e}")
         return jsonify({
@@ -34,7 +63,7 @@ def get_sensors():
 def get_sensor(sensor_id: str):
     """Get a specific sensor by ID."""
     try:
-        sensor = Sensor.query.filter_by(id=sensor_id).first()
+        sensor = db.session.get(Sensor, sensor_id)
         if not sensor:
             return jsonify({
                 'error': 'Sensor not found',
@@ -63,38 +92,35 @@ def get_sensor(sensor_id: str):
 def get_sensor_readings(sensor_id: str):
     """Get readings for a specific sensor."""
     try:
-        # Parse query parameters
-        hours = request.args.get('hours', default=24, type=int)
-        limit = request.args.get('limit', default=1000, type=int)
-        
-        # Validate parameters
-        if hours < 1 or hours > 168:  # Max 1 week
-            hours = 24
-        if limit < 1 or limit > 10000:
-            limit = 1000
+        # Parse and validate query parameters
+        params = parse_int_params(request.args, SENSOR_READINGS_PARAMS)
+        hours, limit = params['hours'], params['limit']
         
         # Calculate time range
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours)
         
-        # Query readings
-        query = SensorReading.query.filter(
+        # Query readings as plain rows, skipping ORM object hydration
+        query = select(*SensorReading.dict_columns()).where(
             SensorReading.sensor_id == sensor_id,
             SensorReading.timestamp >= start_time,
             SensorReading.timestamp <= end_time
-        ).order_by(SensorReading.timestamp.desc()).limit(limit)
+        ).order_by(
+            SensorReading.timestamp.desc()
+        ).limit(limit).execution_options(yield_per=STREAM_CHUNK_SIZE)
         
-        readings = query.all()
+        # Stream the result set so large limits do not materialize in memory;
+        # timestamps are encoded by the serializer
+        readings = SensorReading.iter_dicts(query, isoformat=False)
         
-        return jsonify({
-            'readings': [reading.to_dict() for reading in readings],
+        return stream_list_response('readings', readings, lambda count: {
             'sensor_id': sensor_id,
             'time_range': {
                 'start': start_time.isoformat(),
                 'end': end_time.isoformat(),
                 'hours': hours
             },
-            'count': len(readings),
+            'count': count,
             'status': 'success'
         })
         
@@ -110,28 +136,25 @@ def get_sensor_readings(sensor_id: str):
 def get_all_readings():
     """Get recent readings from all sensors."""
     try:
-        hours = request.args.get('hours', default=1, type=int)
-        limit = request.args.get('limit', default=100, type=int)
-        
-        # Validate parameters
-        if hours < 1 or hours > 24:
-            hours = 1
-        if limit < 1 or limit > 1000:
-            limit = 100
+        # Parse and validate query parameters
+        params = parse_int_params(request.args, ALL_READINGS_PARAMS)
+        hours, limit = params['hours'], params['limit']
         
         # Calculate time range
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours)
         
-        # Query recent readings
-        readings = SensorReading.query.filter(
+        # Query recent readings as plain rows, skipping ORM object hydration
+        query = select(*SensorReading.dict_columns()).where(
             SensorReading.timestamp >= start_time
         ).order_by(
             SensorReading.timestamp.desc()
-        ).limit(limit).all()
+        ).limit(limit)
         
-        return jsonify({
-            'readings': [reading.to_dict() for reading in readings],
+        readings = list(SensorReading.iter_dicts(query, isoformat=False))
+        
+        return json_response({
+            'readings': readings,
             'time_range': {
                 'start': start_time.isoformat(),
                 'end': end_time.isoformat(),
@@ -149,39 +172,53 @@ def get_all_readings():
         }), 500
 
 
+@ttl_cache(STATUS_CACHE_TTL)
+def _compute_status() -> Tuple[Dict[str, Any], str]:
+    """
+    Build the system status payload; cached briefly across requests.
+    
+    Returns:
+        Tuple of (payload, etag); the ETag covers everything but the
+        generation timestamp
+    """
+    # Get latest system status
+    system_status = SystemStatus.query.order_by(
+        SystemStatus.timestamp.desc()
+    ).first()
+    
+    # Get sensor summary
+    status_counts = Sensor.status_counts()
+    sensor_summary = {
+        'total': sum(status_counts.values()),
+        'active': status_counts.get('active', 0),
+        'error': status_counts.get('error', 0),
+        'unavailable': status_counts.get('unavailable', 0)
+    }
+    
+    # Get recent readings count
+    one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    recent_readings = SensorReading.query.filter(
+        SensorReading.timestamp >= one_hour_ago
+    ).count()
+    
+    system_status_data = system_status.to_dict() if system_status else None
+    etag = make_etag(system_status_data, sensor_summary, recent_readings)
+    
+    return {
+        'system_status': system_status_data,
+        'sensor_summary': sensor_summary,
+        'recent_readings': recent_readings,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'status': 'success'
+    }, etag
+
+
 @api_bp.route('/status', methods=['GET'])
 def get_system_status():
     """Get current system status."""
     try:
-        # Get latest system status
-        system_status = SystemStatus.query.order_by(
-            SystemStatus.timestamp.desc()
-        ).first()
-        
-        # Get sensor summary
-        sensors = Sensor.query.all()
-        sensor_summary = {
-            'total': len(sensors),
-            'active': len([s for s in sensors if s.status == 'active']),
-            'error': len([s for s in sensors if s.status == 'error']),
-            'unavailable': len([s for s in sensors if s.status == 'unavailable'])
-        }
-        
-        # Get recent readings count
-        one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
-        recent_readings = SensorReading.query.filter(
-            SensorReading.timestamp >= one_hour_ago
-        ).count()
-        
-        response = {
-            'system_status': system_status.to_dict() if system_status else None,
-            'sensor_summary': sensor_summary,
-            'recent_readings': recent_readings,
-            'timestamp': datetime.now(timezone.utc).isoformat(),
-            'status': 'success'
-        }
-        
-        return jsonify(response)
+        payload, etag = _compute_status()
+        return conditional_response(etag, lambda: jsonify(payload))
         
     except Exception as e:
         logger.error(f"Error fetching system status: {e}")
@@ -224,6 +261,7 @@ def create_reading():
         
         db.session.add(reading)
         db.session.commit()
+        _compute_status.cache_clear()
         
         return jsonify({
             'reading': reading.to_dict(),
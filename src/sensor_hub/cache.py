@@ -0,0 +1,44 @@
+"""Small in-process caching helpers."""
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+
+def ttl_cache(ttl: float) -> Callable:
+    """
+    Memoize a function's results for a fixed number of seconds.
+    
+    Arguments must be hashable. The wrapped function gains a
+    ``cache_clear()`` method for explicit invalidation.
+    
+    Args:
+        ttl: Seconds a cached result stays valid
+    """
+    def decorator(func: Callable) -> Callable:
+        entries: Dict[Tuple, Tuple[float, Any]] = {}
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and entry[0] > now:
+                    return entry[1]
+            
+            value = func(*args, **kwargs)
+            with lock:
+                entries[key] = (now + ttl, value)
+            return value
+        
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+        
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    
+    return decorator
@@ -1,16 +1,42 @@
-"""Command Line Interface for Sensor Hub."""
+"""Command Line Interface for Sensor Hub.
+
+Commands import the discovery service, models and drivers inside their
+bodies so that loading the CLI, and the app that registers it, stays cheap.
+"""
+
+from collections import Counter
 
 import click
 from flask.cli import with_appcontext
 
-from sensor_hub.database import create_tables
-from sensor_hub.discovery_service import discovery_service
+# Readings buffered by start_scheduler before one bulk insert and commit
+SCHEDULER_BATCH_SIZE = 100
+
+# Longest time buffered readings wait before being committed (seconds)
+SCHEDULER_FLUSH_SECONDS = 60.0
+
+# Poll interval for sensors that do not set their own (seconds)
+SCHEDULER_INTERVAL = 30.0
+
+# Upper bound on concurrent sensor reads per scheduler pass
+SCHEDULER_MAX_READ_WORKERS = 16
+
+# Seconds a read may run before its sensor is marked as timed out
+SCHEDULER_READ_TIMEOUT = 2.0
+
+# Column order of the reading tuples buffered by start_scheduler
+SCHEDULER_READING_COLUMNS = (
+    'sensor_id', 'sensor_type', 'timestamp', 'temperature', 'humidity',
+    'pressure', 'light_level', 'ir_level', 'data'
+)
 
 
 @click.command()
 @with_appcontext
 def init_db():
     """Initialize the database tables."""
+    from sensor_hub.database import create_tables
+    
     try:
         create_tables()
         click.echo("Database initialized successfully.")
@@ -22,6 +48,8 @@ def init_db():
 @with_appcontext
 def discover_sensors():
     """Discover and register sensors automatically."""
+    from sensor_hub.discovery_service import discovery_service
+    
     click.echo("Discovering sensors...")
     
     results = discovery_service.discover_and_register(auto_enable=False)
@@ -44,6 +72,8 @@ def discover_sensors():
 @with_appcontext
 def test_sensors():
     """Test connectivity for all registered sensors."""
+    from sensor_hub.discovery_service import discovery_service
+    
     click.echo("Testing sensor connectivity...")
     
     results = discovery_service.test_all_sensors()
@@ -59,6 +89,8 @@ def test_sensors():
 @with_appcontext
 def status():
     """Show discovery service status."""
+    from sensor_hub.discovery_service import discovery_service
+    
     status_info = discovery_service.get_discovery_status()
     
     click.echo("Sensor Hub Status:")
@@ -68,17 +100,177 @@ def status():
     click.echo(f"  Active sensors: {status_info['active_sensors']}")
 
 
+def _flush_scheduler_batch(pending_readings: list, error_deltas: Counter) -> None:
+    """
+    Insert buffered readings and commit them with pending sensor updates.
+    
+    The buffers are emptied only once the commit succeeds. On failure the
+    readings, error counts and sensor status changes are kept for the next
+    flush to retry, and the error is raised.
+    
+    Args:
+        pending_readings: Reading tuples in SCHEDULER_READING_COLUMNS order
+        error_deltas: Sensor ID to failed reads since its last success in
+            this batch, added to error_count in SQL
+    """
+    from sqlalchemy import bindparam, func, inspect, update
+    from sensor_hub.models import Sensor, SensorReading
+    from sensor_hub import db
+    
+    # A rollback expires the loaded sensors and discards their unsaved
+    # status changes, so note them to apply again if the commit fails
+    sensor_changes = [
+        (sensor, {attr.key: attr.history.added[0]
+                  for attr in inspect(sensor).attrs if attr.history.added})
+        for sensor in db.session.dirty if isinstance(sensor, Sensor)
+    ]
+    
+    try:
+        if pending_readings:
+            db.session.execute(SensorReading.__table__.insert(), [
+                dict(zip(SCHEDULER_READING_COLUMNS, row))
+                for row in pending_readings
+            ])
+        
+        if error_deltas:
+            # Write status changes first so increments apply on top of resets
+            db.session.flush()
+            sensors = Sensor.__table__
+            db.session.execute(
+                update(sensors)
+                .where(sensors.c.id == bindparam('sensor_id'))
+                .values(error_count=func.coalesce(sensors.c.error_count, 0)
+                        + bindparam('delta')),
+                [{'sensor_id': sensor_id, 'delta': delta}
+                 for sensor_id, delta in error_deltas.items()]
+            )
+        
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        for sensor, changes in sensor_changes:
+            for key, value in changes.items():
+                setattr(sensor, key, value)
+        raise
+    
+    pending_readings.clear()
+    error_deltas.clear()
+
+
+def _format_reading(sensor_id: str, data_dict: dict) -> str:
+    """Format one reading for the scheduler's console output."""
+    light = data_dict.get('light_level')
+    ir = data_dict.get('ir_level')
+    
+    # Format output based on sensor type
+    if light is not None and ir is not None:
+        # LTR-329: display raw channel values
+        return f"📊 {sensor_id}: CH0={light:.0f}, IR={ir:.0f}"
+    if light is not None:
+        return f"📊 {sensor_id}: Light={light:.2f} lux"
+    
+    temp = data_dict.get('temperature', 'N/A')
+    hum = data_dict.get('humidity', 'N/A')
+    press = data_dict.get('pressure', 'N/A')
+    return f"📊 {sensor_id}: T={temp}°C, H={hum}%, P={press}hPa"
+
+
+def _parse_reading(reading_data: dict) -> tuple:
+    """Split a reading of unknown shape into its column values.
+    
+    Returns:
+        (temperature, humidity, pressure, light_level, ir_level, data)
+    """
+    # BME280 nests its values under 'data'; the other drivers are flat
+    data_dict = reading_data['data'] if 'data' in reading_data else reading_data
+    return (
+        data_dict.get('temperature'),
+        data_dict.get('humidity'),
+        data_dict.get('pressure'),
+        data_dict.get('light_level'),
+        data_dict.get('ir_level'),
+        data_dict
+    )
+
+
+def _parse_bme280_reading(reading_data: dict) -> tuple:
+    """Column values for a BME280 reading ({'data': {...}, 'status': ...})."""
+    data_dict = reading_data.get('data')
+    if data_dict is None:
+        return _parse_reading(reading_data)
+    return (
+        data_dict.get('temperature'),
+        data_dict.get('humidity'),
+        data_dict.get('pressure'),
+        None,
+        None,
+        data_dict
+    )
+
+
+def _parse_ltr329_reading(reading_data: dict) -> tuple:
+    """Column values for a flat LTR-329 reading."""
+    return (
+        reading_data.get('temperature'),
+        reading_data.get('humidity'),
+        reading_data.get('pressure'),
+        reading_data.get('light_level'),
+        reading_data.get('ir_level'),
+        reading_data
+    )
+
+
+def _parse_mpu6050_reading(reading_data: dict) -> tuple:
+    """Column values for a flat MPU6050 reading; only temperature maps."""
+    return (
+        reading_data.get('temperature'),
+        None,
+        None,
+        None,
+        None,
+        reading_data
+    )
+
+
+# Reading parsers by driver type, picked once per sensor when the scheduler
+# starts; unknown types fall back to _parse_reading
+SCHEDULER_READING_PARSERS = {
+    'bme280': _parse_bme280_reading,
+    'ltr329': _parse_ltr329_reading,
+    'mpu6050': _parse_mpu6050_reading,
+}
+
+
+def _read_locked(sensor_instance, bus_lock):
+    """Read a sensor while holding its I2C bus lock."""
+    with bus_lock:
+        return sensor_instance.read()
+
+
 @click.command()
+@click.option('--interval', default=SCHEDULER_INTERVAL, show_default=True,
+              help='Poll interval for sensors without their own')
+@click.option('--batch-size', default=SCHEDULER_BATCH_SIZE, show_default=True,
+              help='Readings buffered before a bulk insert')
+@click.option('--flush-seconds', default=SCHEDULER_FLUSH_SECONDS,
+              show_default=True,
+              help='Maximum seconds readings stay buffered')
+@click.option('--read-timeout', default=SCHEDULER_READ_TIMEOUT, show_default=True,
+              help='Seconds before a running read marks its sensor as timed out')
 @with_appcontext
-def start_scheduler():
+def start_scheduler(interval, batch_size, flush_seconds, read_timeout):
     """Start the sensor reading scheduler."""
     click.echo("Starting sensor scheduler...")
     
+    from concurrent.futures import ThreadPoolExecutor
     from datetime import datetime, timezone
+    import heapq
+    import signal
+    import sys
+    import threading
     import time
-    from sensor_hub.models import Sensor, SensorReading
+    from sensor_hub.models import Sensor
     from sensor_hub.sensor_registry import sensor_registry
-    from sensor_hub import db
     
     try:
         # Get all enabled sensors
@@ -90,15 +282,20 @@ def start_scheduler():
             
         click.echo(f"Found {len(enabled_sensors)} enabled sensors")
         
-        # Create sensor instances
+        # Keep the loaded rows so the loop can update them without re-querying
+        sensor_configs = {sensor.id: sensor for sensor in enabled_sensors}
+        
+        # Create sensor instances; reads on the same bus share a lock. Each
+        # entry is (instance, bus_lock, poll_interval, sensor_type, parser).
         sensor_instances = {}
+        bus_locks = {}
         for sensor_config in enabled_sensors:
             try:
                 # Build configuration dict
                 config = {
                     'i2c_address': sensor_config.i2c_address,
                     'bus_number': sensor_config.bus_number or 1,
-                    'poll_interval': sensor_config.poll_interval or 30
+                    'poll_interval': sensor_config.poll_interval or interval
                 }
                 
                 # Add multiplexer configuration if available
@@ -118,7 +315,13 @@ def start_scheduler():
                     config                      # proper config dict
                 )
                 if sensor_instance and sensor_instance.is_available():
-                    sensor_instances[sensor_config.id] = sensor_instance
+                    bus_lock = bus_locks.setdefault(config['bus_number'],
+                                                    threading.Lock())
+                    sensor_type = sensor_instance.get_sensor_type()
+                    sensor_instances[sensor_config.id] = (
+                        sensor_instance, bus_lock, config['poll_interval'],
+                        sensor_type,
+                        SCHEDULER_READING_PARSERS.get(sensor_type, _parse_reading))
                     click.echo(f"✓ {sensor_config.id} "
                                f"({sensor_config.sensor_type}) ready")
                 else:
@@ -134,86 +337,143 @@ def start_scheduler():
                    f"{len(sensor_instances)} sensors...")
         click.echo("Press Ctrl+C to stop")
         
-        # Data collection loop
-        while True:
+        # Per-reading output is only useful on a terminal; errors are
+        # always reported
+        show_readings = sys.stdout.isatty()
+        
+        # Readings and error counts waiting for the next bulk commit
+        pending_readings = []
+        error_deltas = Counter()
+        last_flush = time.monotonic()
+        
+        # Set when a read finishes or on SIGTERM so the loop wakes early
+        wakeup = threading.Event()
+        stop_event = threading.Event()
+        
+        def handle_sigterm(signum, frame):
+            stop_event.set()
+            wakeup.set()
+        
+        previous_sigterm = signal.signal(signal.SIGTERM, handle_sigterm)
+        
+        # Min-heap of (next due time, sensor_id). Each sensor is polled at
+        # its own interval against monotonic deadlines, so read and commit
+        # time do not add drift.
+        schedule = [(time.monotonic(), sensor_id) for sensor_id in sensor_instances]
+        heapq.heapify(schedule)
+        
+        executor = ThreadPoolExecutor(
+            max_workers=min(SCHEDULER_MAX_READ_WORKERS, len(sensor_instances)))
+        in_flight = {}
+        # Read deadlines for in-flight reads not yet marked as timed out
+        read_deadlines = {}
+        while not stop_event.is_set():
             try:
-                for sensor_id, sensor_instance in sensor_instances.items():
+                # Start reads for every due sensor; only same-bus reads wait
+                # on each other. A sensor whose last read is still running
+                # is not queued again.
+                now = time.monotonic()
+                while schedule[0][0] <= now:
+                    due, sensor_id = schedule[0]
+                    sensor_instance, bus_lock, poll_interval, _, _ = sensor_instances[sensor_id]
+                    if sensor_id in in_flight:
+                        click.echo(f"⏳ {sensor_id} still reading")
+                    else:
+                        future = executor.submit(_read_locked, sensor_instance, bus_lock)
+                        future.add_done_callback(lambda f: wakeup.set())
+                        in_flight[sensor_id] = future
+                        read_deadlines[sensor_id] = now + read_timeout
+                    
+                    # Skip polls missed by a slow read rather than replaying them
+                    next_due = due + poll_interval
+                    if next_due <= now:
+                        next_due = now + poll_interval
+                    heapq.heapreplace(schedule, (next_due, sensor_id))
+                
+                # Sleep until the next sensor is due, a read finishes or a
+                # read overruns its budget
+                wake_at = min([schedule[0][0], *read_deadlines.values()])
+                wakeup.wait(max(0.0, wake_at - time.monotonic()))
+                wakeup.clear()
+                
+                finished = [sensor_id for sensor_id, future in in_flight.items()
+                            if future.done()]
+                lines = []
+                
+                # Readings collected on one wakeup belong to the same poll
+                # cycle and share a wall-clock timestamp
+                tick_time = datetime.now(timezone.utc)
+                
+                # A stuck read cannot be cancelled; flag the sensor once and
+                # keep serving the others. Its result is still used if it
+                # eventually returns.
+                now = time.monotonic()
+                overdue = [sensor_id for sensor_id, deadline in read_deadlines.items()
+                           if deadline <= now and sensor_id not in finished]
+                for sensor_id in overdue:
+                    del read_deadlines[sensor_id]
+                    sensor_configs[sensor_id].status = 'timeout'
+                    lines.append(f"⏱️  {sensor_id} read exceeded {read_timeout}s")
+                
+                for sensor_id in finished:
+                    future = in_flight.pop(sensor_id)
+                    read_deadlines.pop(sensor_id, None)
+                    _, _, _, sensor_type, parse = sensor_instances[sensor_id]
                     try:
-                        # Read sensor data
-                        reading_data = sensor_instance.read()
+                        # Collect sensor data
+                        reading_data = future.result()
                         
                         if reading_data:
-                            # Handle different sensor data formats
-                            if 'data' in reading_data:
-                                # BME280 format: {'data': {...}, 'status': '...'}
-                                data_dict = reading_data['data']
-                            else:
-                                # LTR-329 format: direct data
-                                data_dict = reading_data
-                            
-                            # Create database entry
-                            reading = SensorReading(
-                                sensor_id=sensor_id,
-                                sensor_type=sensor_instance.get_sensor_type(),
-                                timestamp=datetime.now(timezone.utc),
-                                temperature=data_dict.get('temperature'),
-                                humidity=data_dict.get('humidity'),
-                                pressure=data_dict.get('pressure'),
-                                light_level=data_dict.get('light_level'),
-                                ir_level=data_dict.get('ir_level'),
-                                data=data_dict
-                            )
+                            columns = parse(reading_data)
                             
-                            db.session.add(reading)
+                            # Buffer a plain tuple; rows are built at flush time
+                            pending_readings.append((
+                                sensor_id,
+                                sensor_type,
+                                tick_time,
+                                *columns
+                            ))
                             
-                            # Update sensor status
-                            sensor_config = Sensor.query.get(sensor_id)
-                            if sensor_config:
-                                sensor_config.last_reading_at = (
-                                    datetime.now(timezone.utc))
-                                sensor_config.status = 'active'
-                                sensor_config.error_count = 0
+                            # Update sensor status; persisted with the batch
+                            sensor_config = sensor_configs[sensor_id]
+                            sensor_config.last_reading_at = tick_time
+                            sensor_config.status = 'active'
+                            sensor_config.error_count = 0
+                            error_deltas.pop(sensor_id, None)
                             
-                            temp = data_dict.get('temperature', 'N/A')
-                            hum = data_dict.get('humidity', 'N/A')
-                            press = data_dict.get('pressure', 'N/A')
-                            light = data_dict.get('light_level')
-                            ir = data_dict.get('ir_level')
-                            
-                            # Format output based on sensor type
-                            if light is not None and ir is not None:
-                                # LTR-329: display raw channel values
-                                click.echo(f"📊 {sensor_id}: "
-                                           f"CH0={light:.0f}, IR={ir:.0f}")
-                            elif light is not None:
-                                click.echo(f"📊 {sensor_id}: "
-                                           f"Light={light:.2f} lux")
-                            else:
-                                click.echo(f"📊 {sensor_id}: T={temp}°C, "
-                                           f"H={hum}%, P={press}hPa")
+                            if show_readings:
+                                lines.append(_format_reading(sensor_id, columns[-1]))
                         
                     except Exception as e:
-                        click.echo(f"⚠️  Error reading {sensor_id}: {e}")
+                        lines.append(f"⚠️  Error reading {sensor_id}: {e}")
                         
-                        # Update error count
-                        sensor_config = Sensor.query.get(sensor_id)
-                        if sensor_config:
-                            error_count = (sensor_config.error_count or 0) + 1
-                            sensor_config.error_count = error_count
-                            sensor_config.status = 'error'
+                        # Count the error without loading the row; the
+                        # increment is applied in SQL with the batch
+                        sensor_configs[sensor_id].status = 'error'
+                        error_deltas[sensor_id] += 1
                 
-                # Commit all readings
-                db.session.commit()
+                # One write for everything collected on this wakeup
+                if lines:
+                    click.echo('\n'.join(lines))
                 
-                # Wait before next reading (30 seconds)
-                time.sleep(30)
+                # Commit buffered readings once the batch is full or due
+                if (len(pending_readings) >= batch_size or
+                        time.monotonic() - last_flush >= flush_seconds):
+                    last_flush = time.monotonic()
+                    _flush_scheduler_batch(pending_readings, error_deltas)
                 
             except KeyboardInterrupt:
                 click.echo("\n🛑 Scheduler stopped by user")
                 break
             except Exception as e:
                 click.echo(f"⚠️  Scheduler error: {e}")
-                time.sleep(5)  # Short delay before retry
+                stop_event.wait(5)  # Short delay before retry
+        
+        executor.shutdown(wait=False, cancel_futures=True)
+        signal.signal(signal.SIGTERM, previous_sigterm)
+        
+        # Keep whatever was collected since the last commit
+        _flush_scheduler_batch(pending_readings, error_deltas)
                 
     except Exception as e:
         click.echo(f"❌ Failed to start scheduler: {e}")
@@ -18,13 +18,19 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
-        'pool_recycle': 3600,
+        'pool_recycle': 1800,
+        # Sized for the web workers plus the scheduler sharing one database
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', '20')),
     }
     
     # Sensor settings
     SENSOR_POLL_INTERVAL = int(os.environ.get('SENSOR_POLL_INTERVAL', '30'))  # seconds
     I2C_BUS = int(os.environ.get('I2C_BUS', '1'))
     GPIO_MODE = os.environ.get('GPIO_MODE', 'BCM')
+    # Seconds between background live reads for the dashboard; 0 reads
+    # sensors in each request instead
+    LIVE_POLL_INTERVAL = float(os.environ.get('LIVE_POLL_INTERVAL', '2'))
     
     # API settings
     API_RATE_LIMIT = os.environ.get('API_RATE_LIMIT', '100 per hour')
@@ -36,6 +42,12 @@ class Config:
     
     # Timezone
     TIMEZONE = os.environ.get('TIMEZONE', 'UTC')
+    
+    # Cache compiled templates on disk so new workers and restarts skip
+    # Jinja's parse/compile step. Without a directory, Jinja uses a private
+    # per-user directory under the system temp dir.
+    JINJA_BYTECODE_CACHE = True
+    JINJA_CACHE_DIR = os.environ.get('JINJA_CACHE_DIR')
 
 
 class DevelopmentConfig(Config):
@@ -54,7 +66,11 @@ class TestingConfig(Config):
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # In-memory SQLite uses a single static connection; pool sizing does not apply
+    SQLALCHEMY_ENGINE_OPTIONS = {}
     WTF_CSRF_ENABLED = False
+    JINJA_BYTECODE_CACHE = False
+    LIVE_POLL_INTERVAL = 0
 
 
 config = {
@@ -1,12 +1,38 @@
 """Database initialization and utilities."""
 
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from sensor_hub.serialization import JSON_ENGINE_OPTIONS
 
-db = SQLAlchemy()
+# JSON_ENGINE_OPTIONS are defaults; SQLALCHEMY_ENGINE_OPTIONS can override them
+db = SQLAlchemy(engine_options=JSON_ENGINE_OPTIONS)
 migrate = Migrate()
 
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune new SQLite connections for a write-heavy collector.
+    
+    WAL lets web requests read while the scheduler writes, and
+    synchronous=NORMAL drops the per-commit fsync of the WAL file.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')  # 256MB
+    cursor.execute('PRAGMA cache_size=-65536')  # 64MB page cache
+    cursor.close()
+
+
 def init_db(app):
     """Initialize database with app context."""
     db.init_app(app)
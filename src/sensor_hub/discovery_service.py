@@ -1,15 +1,25 @@
 """Auto-discovery service for sensors."""
 
 import logging
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 
+from sqlalchemy import case, func, select, update
+
 from sensor_hub.database import db
 from sensor_hub.models import Sensor
 from sensor_hub.sensor_registry import sensor_registry
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent connectivity probes in test_all_sensors
+MAX_PROBE_WORKERS = 16
+
+# Sensor rows fetched per batch while streaming test_all_sensors
+PROBE_FETCH_SIZE = 100
+
 
 class SensorDiscoveryService:
     """Service for discovering and managing sensors automatically."""
@@ -40,9 +50,12 @@ class SensorDiscoveryService:
             'sensors': []
         }
         
+        # Each sensor gets a SAVEPOINT so one failure does not undo the
+        # others; the whole run is committed once at the end
         for sensor_info in discovered_sensors:
             try:
-                result = self._register_sensor(sensor_info, auto_enable)
+                with db.session.begin_nested():
+                    result = self._register_sensor(sensor_info, auto_enable)
                 results['sensors'].append(result)
                 
                 if result['action'] == 'registered':
@@ -60,6 +73,13 @@ class SensorDiscoveryService:
                     'message': str(e)
                 })
         
+        try:
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Failed to commit discovery results: {e}")
+            db.session.rollback()
+            raise
+        
         self.last_discovery = datetime.now(timezone.utc)
         
         logger.info(f"Discovery complete: {results['registered_count']} registered, "
@@ -72,41 +92,31 @@ class SensorDiscoveryService:
         sensor_id = sensor_info['sensor_id']
         
         # Check if sensor already exists
-        existing_sensor = Sensor.query.filter_by(id=sensor_id).first()
+        existing_sensor = db.session.get(Sensor, sensor_id)
         
         if existing_sensor:
             # Update existing sensor if configuration changed
-            updated = False
-            
-            if existing_sensor.name != sensor_info.get('name'):
-                existing_sensor.name = sensor_info.get('name')
-                updated = True
-            
-            if existing_sensor.location != sensor_info.get('location'):
-                existing_sensor.location = sensor_info.get('location')
-                updated = True
-            
-            if existing_sensor.description != sensor_info.get('description'):
-                existing_sensor.description = sensor_info.get('description')
-                updated = True
-            
-            # Update configuration if different
             config = sensor_info.get('config', {})
-            if existing_sensor.i2c_address != config.get('i2c_address'):
-                existing_sensor.i2c_address = config.get('i2c_address')
-                updated = True
-            
-            if existing_sensor.gpio_pin != config.get('pin'):
-                existing_sensor.gpio_pin = config.get('pin')
-                updated = True
-            
-            if existing_sensor.bus_number != config.get('bus_number', 1):
-                existing_sensor.bus_number = config.get('bus_number', 1)
-                updated = True
+            new_values = {
+                'name': sensor_info.get('name'),
+                'location': sensor_info.get('location'),
+                'description': sensor_info.get('description'),
+                'i2c_address': config.get('i2c_address'),
+                'gpio_pin': config.get('pin'),
+                'bus_number': config.get('bus_number', 1),
+            }
+            changed = {
+                key: value for key, value in new_values.items()
+                if getattr(existing_sensor, key) != value
+            }
             
-            if updated:
-                existing_sensor.updated_at = datetime.now(timezone.utc)
-                db.session.commit()
+            if changed:
+                # One UPDATE for all changed columns
+                db.session.execute(
+                    update(Sensor)
+                    .where(Sensor.id == sensor_id)
+                    .values(**changed, updated_at=datetime.now(timezone.utc))
+                )
                 return {
                     'sensor_id': sensor_id,
                     'action': 'updated',
@@ -145,7 +155,6 @@ class SensorDiscoveryService:
             )
             
             db.session.add(new_sensor)
-            db.session.commit()
             
             return {
                 'sensor_id': sensor_id,
@@ -153,17 +162,8 @@ class SensorDiscoveryService:
                 'message': f'New sensor registered{"and enabled" if auto_enable else ""}'
             }
     
-    def test_sensor_connectivity(self, sensor_id: str) -> Dict[str, Any]:
-        """Test if a registered sensor is responsive."""
-        sensor = Sensor.query.filter_by(id=sensor_id).first()
-        if not sensor:
-            return {
-                'sensor_id': sensor_id,
-                'available': False,
-                'error': 'Sensor not found in database'
-            }
-        
-        # Create sensor instance and test connectivity
+    def _probe_config(self, sensor: Sensor) -> Dict[str, Any]:
+        """Build the driver configuration used to probe a registered sensor."""
         config = {
             'i2c_address': sensor.i2c_address,
             'pin': sensor.gpio_pin,
@@ -177,90 +177,166 @@ class SensorDiscoveryService:
             if 'mux_channel' in sensor.calibration_data:
                 config['mux_channel'] = sensor.calibration_data['mux_channel']
         
-        sensor_instance = sensor_registry.create_sensor(
-            sensor.sensor_type, 
-            sensor_id, 
-            config
-        )
+        return config
+    
+    def _probe(self, sensor_type: str, sensor_id: str, config: Dict[str, Any],
+               bus_lock: threading.Lock) -> Dict[str, Any]:
+        """
+        Create a driver and check that the sensor responds.
+        
+        Touches hardware only, never the database, so it is safe to run
+        from worker threads.
         
-        if not sensor_instance:
+        Returns:
+            ``{'available': bool}``, or ``{'error': str}`` with
+            ``created`` False if no driver instance could be built
+        """
+        with bus_lock:
+            sensor_instance = sensor_registry.create_sensor(sensor_type, sensor_id, config)
+            if not sensor_instance:
+                return {
+                    'created': False,
+                    'error': f'Failed to create {sensor_type} sensor instance'
+                }
+            
+            try:
+                return {'available': sensor_instance.is_available()}
+            except Exception as e:
+                return {'error': str(e)}
+    
+    def _apply_probe(self, sensor: Sensor, probe: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a probe outcome on the sensor row and build its result entry."""
+        if probe.get('created') is False:
             return {
-                'sensor_id': sensor_id,
+                'sensor_id': sensor.id,
                 'available': False,
-                'error': f'Failed to create {sensor.sensor_type} sensor instance'
+                'error': probe['error']
             }
         
-        try:
-            is_available = sensor_instance.is_available()
-            
-            # Update sensor status
-            if is_available:
-                sensor.status = 'active'
-                sensor.error_count = 0
-            else:
-                sensor.status = 'unavailable'
-                sensor.error_count = getattr(sensor, 'error_count', 0) + 1
-            
-            db.session.commit()
-            
+        if 'error' in probe:
+            sensor.status = 'error'
+            sensor.error_count = (sensor.error_count or 0) + 1
             return {
-                'sensor_id': sensor_id,
-                'available': is_available,
-                'status': sensor.status,
-                'sensor_type': sensor.sensor_type
+                'sensor_id': sensor.id,
+                'available': False,
+                'error': probe['error']
             }
-            
-        except Exception as e:
-            sensor.status = 'error'
-            sensor.error_count = getattr(sensor, 'error_count', 0) + 1
-            db.session.commit()
-            
+        
+        # Update sensor status
+        if probe['available']:
+            sensor.status = 'active'
+            sensor.error_count = 0
+        else:
+            sensor.status = 'unavailable'
+            sensor.error_count = (sensor.error_count or 0) + 1
+        
+        return {
+            'sensor_id': sensor.id,
+            'available': probe['available'],
+            'status': sensor.status,
+            'sensor_type': sensor.sensor_type
+        }
+    
+    def test_sensor_connectivity(self, sensor_id: str,
+                                 sensor: Optional[Sensor] = None) -> Dict[str, Any]:
+        """
+        Test if a registered sensor is responsive.
+        
+        Args:
+            sensor_id: ID of the sensor to test
+            sensor: Already-loaded row for the sensor, skipping the lookup
+        
+        Returns:
+            Dictionary with the connectivity result
+        """
+        if sensor is None:
+            sensor = db.session.get(Sensor, sensor_id)
+        if not sensor:
             return {
                 'sensor_id': sensor_id,
                 'available': False,
-                'error': str(e)
+                'error': 'Sensor not found in database'
             }
+        
+        probe = self._probe(sensor.sensor_type, sensor_id,
+                            self._probe_config(sensor), threading.Lock())
+        result = self._apply_probe(sensor, probe)
+        if probe.get('created') is not False:
+            db.session.commit()
+        
+        return result
+    
+    def _record_probes(self, probed: List[Any], results: Dict[str, Any]) -> None:
+        """Apply finished probes to their rows and tally them into results."""
+        for sensor, future in probed:
+            status = self._apply_probe(sensor, future.result())
+            results['sensor_status'].append(status)
+            results['total_sensors'] += 1
+            
+            if status.get('available'):
+                results['available_sensors'] += 1
+            elif 'error' in status:
+                results['error_sensors'] += 1
+            else:
+                results['unavailable_sensors'] += 1
     
     def test_all_sensors(self) -> Dict[str, Any]:
-        """Test connectivity for all registered sensors."""
-        sensors = Sensor.query.all()
+        """Test connectivity for all registered sensors.
         
+        Sensors are streamed from the database in batches and probed
+        concurrently while the next batch is fetched; probes on the same
+        I2C bus are serialized. Database updates stay on the calling
+        thread and are committed once.
+        """
         results = {
-            'total_sensors': len(sensors),
+            'total_sensors': 0,
             'available_sensors': 0,
             'unavailable_sensors': 0,
             'error_sensors': 0,
             'sensor_status': []
         }
         
-        for sensor in sensors:
-            status = self.test_sensor_connectivity(sensor.id)
-            results['sensor_status'].append(status)
+        query = select(Sensor).execution_options(yield_per=PROBE_FETCH_SIZE)
+        bus_locks = {}
+        probed = []
+        with ThreadPoolExecutor(max_workers=MAX_PROBE_WORKERS) as executor:
+            for batch in db.session.execute(query).scalars().partitions():
+                # Resolve everything the workers need before leaving this thread
+                submitted = []
+                for sensor in batch:
+                    config = self._probe_config(sensor)
+                    bus_lock = bus_locks.setdefault(config['bus_number'], threading.Lock())
+                    submitted.append((sensor, executor.submit(
+                        self._probe, sensor.sensor_type, sensor.id, config, bus_lock)))
+                
+                # Record the previous batch while this one is being probed
+                self._record_probes(probed, results)
+                probed = submitted
             
-            if status.get('available'):
-                results['available_sensors'] += 1
-            elif 'error' in status:
-                results['error_sensors'] += 1
-            else:
-                results['unavailable_sensors'] += 1
+            self._record_probes(probed, results)
+        
+        # Persist all status updates together
+        db.session.commit()
         
         return results
     
     def get_discovery_status(self) -> Dict[str, Any]:
         """Get current discovery status and statistics."""
-        total_sensors = Sensor.query.count()
-        active_sensors = Sensor.query.filter_by(status='active').count()
-        error_sensors = Sensor.query.filter_by(status='error').count()
-        unavailable_sensors = Sensor.query.filter_by(status='unavailable').count()
-        enabled_sensors = Sensor.query.filter_by(enabled=True).count()
+        # Per-status totals and enabled counts in one aggregate query
+        rows = db.session.query(
+            Sensor.status,
+            func.count(Sensor.id),
+            func.sum(case((Sensor.enabled.is_(True), 1), else_=0))
+        ).group_by(Sensor.status).all()
+        status_counts = {status: count for status, count, _ in rows}
         
         return {
             'last_discovery': self.last_discovery.isoformat() if self.last_discovery else None,
-            'total_sensors': total_sensors,
-            'active_sensors': active_sensors,
-            'error_sensors': error_sensors,
-            'unavailable_sensors': unavailable_sensors,
-            'enabled_sensors': enabled_sensors,
+            'total_sensors': sum(status_counts.values()),
+            'active_sensors': status_counts.get('active', 0),
+            'error_sensors': status_counts.get('error', 0),
+            'unavailable_sensors': status_counts.get('unavailable', 0),
+            'enabled_sensors': sum(enabled or 0 for _, _, enabled in rows),
             'available_sensor_types': sensor_registry.get_available_types()
         }
 
@@ -1,12 +1,59 @@
 """Centralized logging configuration for Sensor Hub."""
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
+# Numeric levels for the names accepted by log_sensor_event
+_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL
+}
+
+# Background listener that writes queued records to the real handlers
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Loggers whose levels configure_module_loggers manages
+SENSOR_HUB_MODULES = (
+    'sensor_hub',
+    'sensor_hub.sensors',
+    'sensor_hub.routes',
+    'sensor_hub.api',
+    'sensor_hub.cli',
+    'sensor_hub.database',
+    'sensor_hub.sensor_registry',
+    'sensor_hub.discovery_service'
+)
+EXTERNAL_MODULES = (
+    'werkzeug',
+    'flask',
+    'urllib3',
+    'requests',
+    'sqlalchemy',
+    'alembic'
+)
+HARDWARE_MODULES = (
+    'adafruit_bme280',
+    'adafruit_ltr329_ltr303',
+    'board',
+    'busio'
+)
+
+# Level gates for the per-reading helpers, refreshed by setup_logging so a
+# disabled level costs one global lookup
+_DEBUG_ENABLED = True
+_INFO_ENABLED = True
+
 
 class SensorHubFormatter(logging.Formatter):
     """Custom formatter for Sensor Hub with colored output for console."""
@@ -21,47 +68,74 @@ class SensorHubFormatter(logging.Formatter):
         'RESET': '\033[0m'        # Reset
     }
     
+    # Timestamp layout of every record
+    TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+    
+    # Record layouts with and without the sensor context column
+    FORMAT_WITH_CONTEXT = "%s | %s | %-25s | %-20s | %s"
+    FORMAT_NO_CONTEXT = "%s | %s | %-25s | %s"
+    
     def __init__(self, use_colors: bool = False):
         """Initialize formatter with optional color support."""
         self.use_colors = use_colors
         super().__init__()
+        
+        # Whether stderr is a terminal does not change while running, so
+        # the level column is rendered once per level here
+        colored = use_colors and sys.stderr.isatty()
+        reset = self.COLORS['RESET']
+        self._level_tags = {
+            level: f"{color}{level}{reset}" if colored else f"{level:8}"
+            for level, color in self.COLORS.items() if level != 'RESET'
+        }
+        
+        # Last formatted second, per thread
+        self._time_cache = threading.local()
+    
+    def formatTime(self, record, datefmt=None):
+        """Format the record time, reusing the string within the same second."""
+        if datefmt != self.TIME_FORMAT:
+            return super().formatTime(record, datefmt)
+        
+        cache = self._time_cache
+        second = int(record.created)
+        if getattr(cache, 'second', None) != second:
+            cache.second = second
+            cache.text = time.strftime(datefmt, self.converter(second))
+        return cache.text
     
     def format(self, record):
         """Format log record with optional colors."""
-        # Add sensor context if available
-        sensor_id = getattr(record, 'sensor_id', None)
-        sensor_type = getattr(record, 'sensor_type', None)
-        
         # Build the log message format
-        timestamp = self.formatTime(record, '%Y-%m-%d %H:%M:%S')
-        level = record.levelname
-        logger_name = record.name
-        message = record.getMessage()
+        timestamp = self.formatTime(record, self.TIME_FORMAT)
+        level = self._level_tags.get(record.levelname)
+        if level is None:
+            level = f"{record.levelname:8}"
+        if record.args or not isinstance(record.msg, str):
+            message = record.getMessage()
+        else:
+            message = record.msg
         
         # Add exception info if present
         if record.exc_info:
             message += '\n' + self.formatException(record.exc_info)
         
-        # Build context info
-        context_parts = []
-        if sensor_id:
-            context_parts.append(f"sensor:{sensor_id}")
-        if sensor_type:
-            context_parts.append(f"type:{sensor_type}")
-        
-        context = f"[{', '.join(context_parts)}]" if context_parts else ""
-        
-        # Apply colors for console output
-        if self.use_colors and sys.stderr.isatty():
-            color = self.COLORS.get(level, '')
-            reset = self.COLORS['RESET']
-            level = f"{color}{level}{reset}"
+        # Add sensor context if available
+        sensor_id = getattr(record, 'sensor_id', None)
+        sensor_type = getattr(record, 'sensor_type', None)
+        if not sensor_id and not sensor_type:
+            return self.FORMAT_NO_CONTEXT % (
+                timestamp, level, record.name, message)
         
-        # Format final message
-        if context:
-            return f"{timestamp} | {level:8} | {logger_name:25} | {context:20} | {message}"
+        if sensor_id and sensor_type:
+            context = f"[sensor:{sensor_id}, type:{sensor_type}]"
+        elif sensor_id:
+            context = f"[sensor:{sensor_id}]"
         else:
-            return f"{timestamp} | {level:8} | {logger_name:25} | {message}"
+            context = f"[type:{sensor_type}]"
+        
+        return self.FORMAT_WITH_CONTEXT % (
+            timestamp, level, record.name, context, message)
 
 
 def setup_logging(
@@ -83,10 +157,15 @@ def setup_logging(
         enable_console: Whether to log to console
         enable_colors: Whether to use colors in console output
     """
+    global _listener
+    
     # Convert string log level to logging constant
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
     
-    # Clear any existing handlers
+    # Clear any existing handlers, draining the previous listener first
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
     root_logger = logging.getLogger()
     root_logger.handlers.clear()
     
@@ -117,59 +196,75 @@ def setup_logging(
         file_handler.setFormatter(SensorHubFormatter(use_colors=False))
         handlers.append(file_handler)
     
-    # Add handlers to root logger
-    for handler in handlers:
-        root_logger.addHandler(handler)
+    # Logging threads only enqueue records; a listener thread does the
+    # console and file I/O
+    if handlers:
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
     
     # Configure specific loggers with appropriate levels
     configure_module_loggers(numeric_level)
+    refresh_log_gates()
     
     # Log startup message
     logger = logging.getLogger(__name__)
     logger.info(f"Logging configured - Level: {log_level}, File: {log_file}")
 
 
+def refresh_log_gates() -> None:
+    """Recompute the DEBUG/INFO gates from the sensor_hub logger's level."""
+    global _DEBUG_ENABLED, _INFO_ENABLED
+    
+    logger = logging.getLogger('sensor_hub')
+    _DEBUG_ENABLED = logger.isEnabledFor(logging.DEBUG)
+    _INFO_ENABLED = logger.isEnabledFor(logging.INFO)
+
+
+def _stop_listener() -> None:
+    """Flush queued records at interpreter exit."""
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
+
+
 def configure_module_loggers(base_level: int) -> None:
     """Configure specific loggers for different modules."""
-    
+    for name, level in _module_levels(base_level):
+        logger = logging.getLogger(name)
+        # setLevel clears every logger's level cache, so skip no-op changes
+        if logger.level != level:
+            logger.setLevel(level)
+
+
+def _module_levels(base_level: int):
+    """Yield (logger name, level) pairs for configure_module_loggers."""
     # Sensor Hub modules - use base level
-    sensor_hub_modules = [
-        'sensor_hub',
-        'sensor_hub.sensors',
-        'sensor_hub.routes',
-        'sensor_hub.api',
-        'sensor_hub.cli',
-        'sensor_hub.database',
-        'sensor_hub.sensor_registry',
-        'sensor_hub.discovery_service'
-    ]
-    
-    for module in sensor_hub_modules:
-        logging.getLogger(module).setLevel(base_level)
+    for name in SENSOR_HUB_MODULES:
+        yield name, base_level
     
     # Third-party libraries - set to WARNING to reduce noise
-    external_modules = [
-        'werkzeug',
-        'flask',
-        'urllib3',
-        'requests',
-        'sqlalchemy',
-        'alembic'
-    ]
-    
-    for module in external_modules:
-        logging.getLogger(module).setLevel(logging.WARNING)
+    for name in EXTERNAL_MODULES:
+        yield name, logging.WARNING
     
     # Hardware-related modules - keep at INFO for troubleshooting
-    hardware_modules = [
-        'adafruit_bme280',
-        'adafruit_ltr329_ltr303',
-        'board',
-        'busio'
-    ]
+    hardware_level = max(base_level, logging.INFO)
+    for name in HARDWARE_MODULES:
+        yield name, hardware_level
+
+
+class SensorLoggerAdapter(logging.LoggerAdapter):
+    """Logger adapter that adds sensor context to every record."""
     
-    for module in hardware_modules:
-        logging.getLogger(module).setLevel(max(base_level, logging.INFO))
+    def process(self, msg, kwargs):
+        extra = kwargs.setdefault('extra', {})
+        extra.update(self.extra)
+        return msg, kwargs
 
 
 def get_sensor_logger(name: str, sensor_id: str = None, sensor_type: str = None):
@@ -182,22 +277,19 @@ def get_sensor_logger(name: str, sensor_id: str = None, sensor_type: str = None)
         sensor_type: Optional sensor type for context
         
     Returns:
-        Logger with sensor context
+        Logger with sensor context, or the plain logger when there is none
     """
     logger = logging.getLogger(name)
     
-    # Create a wrapper that adds sensor context to log records
-    class SensorLoggerAdapter(logging.LoggerAdapter):
-        def process(self, msg, kwargs):
-            extra = kwargs.get('extra', {})
-            if sensor_id:
-                extra['sensor_id'] = sensor_id
-            if sensor_type:
-                extra['sensor_type'] = sensor_type
-            kwargs['extra'] = extra
-            return msg, kwargs
+    context = {}
+    if sensor_id:
+        context['sensor_id'] = sensor_id
+    if sensor_type:
+        context['sensor_type'] = sensor_type
+    if not context:
+        return logger
     
-    return SensorLoggerAdapter(logger, {})
+    return SensorLoggerAdapter(logger, context)
 
 
 def log_sensor_event(logger, level: str, sensor_id: str, sensor_type: str, 
@@ -214,18 +306,25 @@ def log_sensor_event(logger, level: str, sensor_id: str, sensor_type: str,
         details: Optional additional details
         **kwargs: Additional context data
     """
-    log_func = getattr(logger, level.lower())
+    numeric_level = _LEVELS[level.lower()]
     
-    message = f"{event}"
+    # Skip building the message when the record would be discarded
+    if not logger.isEnabledFor(numeric_level):
+        return
+    
+    # Interpolation is left to the logger
+    message = "%s"
+    args = [event]
     if details:
-        message += f" - {details}"
+        message += " - %s"
+        args.append(details)
     
     # Add context data
     if kwargs:
-        context_str = ", ".join([f"{k}={v}" for k, v in kwargs.items()])
-        message += f" ({context_str})"
+        message += " (%s)"
+        args.append(", ".join([f"{k}={v}" for k, v in kwargs.items()]))
     
-    log_func(message, extra={
+    logger.log(numeric_level, message, *args, extra={
         'sensor_id': sensor_id,
         'sensor_type': sensor_type
     })
@@ -235,6 +334,8 @@ def log_sensor_event(logger, level: str, sensor_id: str, sensor_type: str,
 def log_sensor_init(logger, sensor_id: str, sensor_type: str, success: bool = True, error: str = None):
     """Log sensor initialization."""
     if success:
+        if not _INFO_ENABLED:
+            return
         log_sensor_event(logger, 'info', sensor_id, sensor_type, 
                         "Sensor initialized successfully")
     else:
@@ -244,6 +345,10 @@ def log_sensor_init(logger, sensor_id: str, sensor_type: str, success: bool = Tr
 
 def log_sensor_reading(logger, sensor_id: str, sensor_type: str, data: dict):
     """Log successful sensor reading."""
+    # Readings are logged at DEBUG; skip the formatting when that is off
+    if not _DEBUG_ENABLED or not logger.isEnabledFor(logging.DEBUG):
+        return
+    
     # Format data for logging (avoid sensitive info)
     formatted_data = {k: f"{v:.2f}" if isinstance(v, float) else str(v) 
                      for k, v in data.items() if v is not None}
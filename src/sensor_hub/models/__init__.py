@@ -1,23 +1,60 @@
 """Database models for Sensor Hub."""
 
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 
 from sensor_hub import db
 
+# JSON everywhere, stored as binary JSONB on PostgreSQL so it is parsed once
+# at insert instead of on every read
+JSONType = db.JSON().with_variant(JSONB(), 'postgresql')
+
+
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database."""
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    # now() follows the session time zone; stored timestamps are UTC
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, 'sqlite')
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has whole seconds on SQLite. SQLAlchemy stores
+    # and binds DATETIME as text with six fractional digits and SQLite
+    # compares that text as strings, so pad the milliseconds to match.
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
 
 class SensorReading(db.Model):
     """Model for storing sensor readings."""
     
     __tablename__ = 'sensor_readings'
+    __table_args__ = (
+        # Serves per-sensor time-range queries ordered by timestamp; also
+        # covers lookups on sensor_id alone via its leading column.
+        db.Index('ix_readings_sensor_ts', 'sensor_id', 'timestamp'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    sensor_id = db.Column(db.String(50), nullable=False, index=True)
+    sensor_id = db.Column(db.String(50), nullable=False)
     sensor_type = db.Column(db.String(50), nullable=False)
     timestamp = db.Column(
         db.DateTime, 
         nullable=False, 
-        default=lambda: datetime.now(timezone.utc),
+        server_default=utcnow(),
         index=True
     )
     
@@ -32,7 +69,7 @@ class SensorReading(db.Model):
     proximity = db.Column(db.Integer, nullable=True)
     
     # Generic JSON field for additional sensor data
-    data = db.Column(db.JSON, nullable=True)
+    data = db.Column(JSONType, nullable=True)
     
     # Status fields
     status = db.Column(db.String(20), default='active')
@@ -58,12 +95,80 @@ class SensorReading(db.Model):
             'status': self.status,
             'error_message': self.error_message
         }
+    
+    @classmethod
+    def dict_columns(cls) -> tuple:
+        """Columns to select for row-level serialization, in to_dict() order."""
+        return (
+            cls.id, cls.sensor_id, cls.sensor_type, cls.timestamp,
+            cls.temperature, cls.humidity, cls.pressure, cls.light_level,
+            cls.ir_level, cls.proximity, cls.data, cls.status,
+            cls.error_message
+        )
+    
+    @classmethod
+    def latest_per_sensor(cls, *columns) -> Dict[str, 'SensorReading']:
+        """Latest reading of every sensor, fetched in one query.
+        
+        Args:
+            columns: Optional subset of columns to load; the rest are
+                deferred and only fetched if accessed
+        
+        Returns:
+            Mapping of sensor_id to its most recent reading
+        """
+        latest = db.session.query(
+            cls.sensor_id, db.func.max(cls.timestamp).label('timestamp')
+        ).group_by(cls.sensor_id).subquery()
+        query = cls.query
+        if columns:
+            query = query.options(db.load_only(cls.sensor_id, *columns))
+        readings = query.join(
+            latest,
+            db.and_(cls.sensor_id == latest.c.sensor_id,
+                    cls.timestamp == latest.c.timestamp)
+        ).all()
+        return {reading.sensor_id: reading for reading in readings}
+    
+    @staticmethod
+    def row_to_dict(row) -> Dict[str, Any]:
+        """Convert a row selected with dict_columns() to the to_dict() shape."""
+        result = row._asdict()
+        result['timestamp'] = result['timestamp'].isoformat()
+        return result
+    
+    @classmethod
+    def iter_dicts(cls, statement,
+                   isoformat: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a select of dict_columns() and yield rows in the to_dict() shape.
+        
+        Args:
+            statement: Select built from dict_columns(), with any filters
+            isoformat: Convert timestamps to ISO 8601 strings; pass False when
+                the dictionaries go straight to serialization.dumps, which
+                encodes datetimes to the same strings itself
+        
+        Returns:
+            Iterator of reading dictionaries, fetched as plain rows
+        
+        The statement runs when this is called, so database errors surface
+        to the caller before any row is consumed; only fetching is lazy.
+        """
+        result = db.session.execute(statement)
+        if not isoformat:
+            return (row._asdict() for row in result)
+        return (cls.row_to_dict(row) for row in result)
 
 
 class Sensor(db.Model):
     """Model for sensor configuration."""
     
     __tablename__ = 'sensors'
+    __table_args__ = (
+        # Serves the enabled-sensor scans and per-status counts
+        db.Index('ix_sensors_enabled_status', 'enabled', 'status'),
+    )
     
     id = db.Column(db.String(50), primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -84,12 +189,12 @@ class Sensor(db.Model):
     location = db.Column(db.String(100), nullable=True)
     created_at = db.Column(
         db.DateTime, 
-        default=lambda: datetime.now(timezone.utc)
+        server_default=utcnow()
     )
     updated_at = db.Column(
         db.DateTime, 
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc)
+        server_default=utcnow(),
+        onupdate=utcnow()
     )
     
     # Status tracking
@@ -136,12 +241,27 @@ class Sensor(db.Model):
         }
     
     def get_latest_reading(self) -> Optional['SensorReading']:
-        """Get the most recent reading for this sensor."""
-        return SensorReading.query.filter_by(
-            sensor_id=self.id
-        ).order_by(
-            SensorReading.timestamp.desc()
+        """
+        Get the most recent reading for this sensor.
+        
+        A single LIMIT 1 statement that walks ix_readings_sensor_ts backwards;
+        use SensorReading.latest_per_sensor() when listing many sensors.
+        """
+        return db.session.scalars(
+            db.select(SensorReading).where(
+                SensorReading.sensor_id == self.id
+            ).order_by(
+                SensorReading.timestamp.desc()
+            ).limit(1)
         ).first()
+    
+    @classmethod
+    def status_counts(cls) -> Dict[str, int]:
+        """Count sensors per status with a single GROUP BY query."""
+        rows = db.session.query(
+            cls.status, db.func.count(cls.id)
+        ).group_by(cls.status).all()
+        return {status: count for status, count in rows}
 
 
 class SystemStatus(db.Model):
@@ -153,7 +273,7 @@ class SystemStatus(db.Model):
     timestamp = db.Column(
         db.DateTime, 
         nullable=False, 
-        default=lambda: datetime.now(timezone.utc)
+        server_default=utcnow()
     )
     
     # System metrics
@@ -0,0 +1,211 @@
+"""Background polling of live sensor readings for the web pages."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sensor_hub.models import Sensor
+from sensor_hub.sensor_registry import sensor_registry
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on live sensor reads running at once
+LIVE_READ_MAX_WORKERS = 8
+
+# Seconds a sensor keeps being polled after the last page asked for it
+LIVE_POLL_IDLE_TIMEOUT = 60
+
+
+# Live reads; threads are started on demand
+_live_read_executor = ThreadPoolExecutor(max_workers=LIVE_READ_MAX_WORKERS,
+                                         thread_name_prefix='live-read')
+
+# I2C bus number -> lock; reads on one bus (and its multiplexers) must not
+# interleave, reads on different buses run in parallel
+_bus_locks: Dict[int, threading.Lock] = {}
+
+
+# Sensor ID -> (configuration key, driver instance) reused across reads
+_sensor_instances: Dict[str, Tuple[tuple, Any]] = {}
+
+
+def _sensor_instance(sensor_class, sensor: Sensor):
+    """Driver instance for a sensor row, rebuilt only when its config changes."""
+    key = (sensor_class, sensor.i2c_address,
+           json.dumps(sensor.calibration_data, sort_keys=True, default=str))
+    cached = _sensor_instances.get(sensor.id)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    config = {'i2c_address': sensor.i2c_address}
+    if sensor.calibration_data:
+        config.update(sensor.calibration_data)
+    instance = sensor_class(sensor.id, config)
+    _sensor_instances[sensor.id] = (key, instance)
+    return instance
+
+
+def _read_live(sensor_class, sensor: Sensor, bus_lock: threading.Lock):
+    """Read a sensor through its cached driver while holding its bus lock."""
+    with bus_lock:
+        instance = _sensor_instance(sensor_class, sensor)
+        try:
+            reading = instance.read()
+        except Exception:
+            _sensor_instances.pop(sensor.id, None)
+            raise
+        
+        # A failing driver is rebuilt on the next read, which retries its
+        # initialization
+        if not reading or 'error' in reading:
+            _sensor_instances.pop(sensor.id, None)
+        return reading
+
+
+def read_sensors_live(sensors: List[Sensor]) -> Dict[str, Future]:
+    """
+    Start a live read of every sensor that has a registered driver.
+    
+    Args:
+        sensors: Sensor rows to read
+    
+    Returns:
+        Sensor ID to the future of its driver's read(); sensors without a
+        driver are left out
+    """
+    # Resolve each sensor type's driver once rather than once per sensor
+    classes = {sensor_type: sensor_registry.get_sensor_class(sensor_type)
+               for sensor_type in {sensor.sensor_type for sensor in sensors}}
+    
+    futures = {}
+    for sensor in sensors:
+        sensor_class = classes[sensor.sensor_type]
+        if sensor_class:
+            bus_lock = _bus_locks.setdefault(sensor.bus_number or 1,
+                                             threading.Lock())
+            futures[sensor.id] = _live_read_executor.submit(
+                _read_live, sensor_class, sensor, bus_lock)
+    return futures
+
+
+class LivePoller:
+    """
+    Keeps the latest live reading of every sensor the pages show.
+    
+    Sensors are polled in a background thread while pages keep asking for
+    them, so requests return the last result instead of waiting on the
+    I2C bus, and any number of viewers share one read per interval. A
+    sensor is read in the request only the first time it is asked for.
+    With an interval of 0 there is no thread and every call reads live.
+    """
+    
+    def __init__(self, interval: float = 2.0,
+                 idle_timeout: float = LIVE_POLL_IDLE_TIMEOUT):
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Sensor ID -> (sensor row, monotonic time it was last asked for)
+        self._watched: Dict[str, Tuple[Sensor, float]] = {}
+        # Sensor ID -> reading dict, or the exception its read raised
+        self._results: Dict[str, Any] = {}
+    
+    def init_app(self, app) -> None:
+        """Take the polling interval from LIVE_POLL_INTERVAL."""
+        self.interval = app.config.get('LIVE_POLL_INTERVAL', self.interval)
+    
+    def readings(self, sensors: List[Sensor]) -> Dict[str, Any]:
+        """
+        Latest live result of each sensor that has a registered driver.
+        
+        Args:
+            sensors: Sensor rows shown by the caller
+        
+        Returns:
+            Sensor ID to its reading dict, or to the exception raised by
+            its last read; sensors without a driver are left out
+        """
+        if self.interval <= 0:
+            return self._poll(sensors)
+        
+        now = time.monotonic()
+        with self._lock:
+            for sensor in sensors:
+                self._watched[sensor.id] = (sensor, now)
+            missing = [s for s in sensors if s.id not in self._results]
+        
+        if missing:
+            self._poll(missing)
+        self._ensure_running()
+        
+        with self._lock:
+            return {s.id: self._results[s.id]
+                    for s in sensors if s.id in self._results}
+    
+    def stop(self) -> None:
+        """Stop the polling thread and forget all results."""
+        thread = self._thread
+        self._thread = None
+        self._wakeup.set()
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            self._watched.clear()
+            self._results.clear()
+    
+    def _poll(self, sensors: List[Sensor]) -> Dict[str, Any]:
+        results = {}
+        for sensor_id, future in read_sensors_live(sensors).items():
+            try:
+                results[sensor_id] = future.result()
+            except Exception as e:
+                # Log when a sensor starts failing, not on every poll
+                if not isinstance(self._results.get(sensor_id), Exception):
+                    logger.error(f"Error reading sensor {sensor_id}: {e}")
+                results[sensor_id] = e
+        
+        with self._lock:
+            self._results.update(results)
+        return results
+    
+    def _ensure_running(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._wakeup.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='live-poller', daemon=True)
+            self._thread.start()
+    
+    def _run(self) -> None:
+        current = threading.current_thread()
+        while self.interval > 0 and not self._wakeup.wait(self.interval):
+            if self._thread is not current:
+                return
+            
+            # Stop polling sensors no page has asked for in a while
+            cutoff = time.monotonic() - self.idle_timeout
+            with self._lock:
+                for sensor_id, (_, asked) in list(self._watched.items()):
+                    if asked < cutoff:
+                        del self._watched[sensor_id]
+                        self._results.pop(sensor_id, None)
+                sensors = [sensor for sensor, _ in self._watched.values()]
+            
+            if sensors:
+                try:
+                    self._poll(sensors)
+                except Exception as e:
+                    logger.error(f"Live sensor poll failed: {e}")
+        
+        # Polling was switched off; a later call starts a new thread
+        with self._lock:
+            if self._thread is current:
+                self._thread = None
+
+
+live_poller = LivePoller()
@@ -0,0 +1,64 @@
+"""Query string parsing shared by the API and page routes."""
+
+from datetime import datetime, timezone
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+
+class IntParam(NamedTuple):
+    """Integer query parameter with a default and an inclusive valid range."""
+    default: int
+    minimum: int
+    maximum: int
+
+
+def parse_int_params(
+    args: Mapping[str, Optional[str]],
+    schema: Dict[str, IntParam]
+) -> Dict[str, int]:
+    """
+    Parse integer query parameters against a schema in one pass.
+    
+    Missing, malformed and out-of-range values fall back to the default.
+    
+    Args:
+        args: Query arguments, usually ``request.args``
+        schema: Parameter name to its IntParam specification
+    
+    Returns:
+        Parameter name to validated integer value
+    """
+    parsed = {}
+    for name, param in schema.items():
+        try:
+            value = int(args.get(name))
+        except (TypeError, ValueError):
+            value = param.default
+        else:
+            if not param.minimum <= value <= param.maximum:
+                value = param.default
+        parsed[name] = value
+    return parsed
+
+
+def parse_keyset_cursor(
+    args: Mapping[str, Optional[str]]
+) -> Optional[Tuple[datetime, int]]:
+    """
+    Parse a ``before_ts``/``before_id`` keyset pagination cursor.
+    
+    Args:
+        args: Query arguments, usually ``request.args``
+    
+    Returns:
+        (timestamp, id) of the last row already shown, as naive UTC to match
+        the stored timestamps, or None when either part is missing or
+        malformed so the listing starts from the newest row
+    """
+    try:
+        before_ts = datetime.fromisoformat(args.get('before_ts'))
+        before_id = int(args.get('before_id'))
+    except (TypeError, ValueError):
+        return None
+    if before_ts.tzinfo is not None:
+        before_ts = before_ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return before_ts, before_id
@@ -1,80 +1,301 @@
 """Main web interface routes."""
 
-from flask import Blueprint, render_template, request, jsonify
+from collections import Counter
+from flask import Blueprint, render_template, request, jsonify, stream_template
 from datetime import datetime, timezone, timedelta
+from itertools import chain
 import logging
 import time
+from typing import Any, Dict, Optional, Tuple
 
+from sqlalchemy import event, func, select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from sensor_hub.cache import ttl_cache
+from sensor_hub.database import db
 from sensor_hub.models import Sensor, SensorReading, SystemStatus
-from sensor_hub.sensor_registry import SensorRegistry
+from sensor_hub.poller import live_poller
+from sensor_hub.query_params import (
+    IntParam, parse_int_params, parse_keyset_cursor
+)
+from sensor_hub.serialization import (
+    STREAM_CHUNK_SIZE, conditional_response, json_response, make_etag,
+    script_json
+)
 
 logger = logging.getLogger(__name__)
 
 main_bp = Blueprint('main', __name__)
 
+# Time window for the reading pages
+HOURS_PARAMS = {'hours': IntParam(default=24, minimum=1, maximum=168)}  # Max 1 week
+
+# Seconds the sensor list is reused between page requests. Commits made in
+# this process invalidate it at once; status changes written by the
+# scheduler or data collector processes show up once it expires.
+SENSOR_LIST_TTL = 5
+
+# Sensor columns used by the pages and the live poller
+SENSOR_LIST_COLUMNS = (
+    Sensor.id, Sensor.name, Sensor.sensor_type, Sensor.status,
+    Sensor.location, Sensor.i2c_address, Sensor.bus_number,
+    Sensor.calibration_data, Sensor.last_reading_at
+)
+
+# Seconds the latest system status row and the /api/system/stats payload
+# are reused between requests
+SYSTEM_STATS_TTL = 5
+
+# Readings per page on the sensor detail and data pages
+SENSOR_DETAIL_PAGE_SIZE = 1000
+DATA_VIEW_PAGE_SIZE = 5000
+
+
+@ttl_cache(SENSOR_LIST_TTL)
+def _get_sensors() -> Tuple[Row, ...]:
+    """
+    All sensors as immutable rows of SENSOR_LIST_COLUMNS.
+    
+    Plain rows rather than ORM instances, so the cached list carries no
+    session state and is safe to share between request threads.
+    """
+    return tuple(db.session.execute(select(*SENSOR_LIST_COLUMNS)).all())
+
+
+def _note_sensor_flush(session, flush_context):
+    """Flag sessions that flushed sensor changes through the ORM."""
+    if any(isinstance(obj, Sensor)
+           for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['sensors_changed'] = True
+
+
+def _note_sensor_statement(orm_execute_state):
+    """Flag sessions that ran bulk INSERT/UPDATE/DELETE statements on sensors."""
+    if orm_execute_state.is_select:
+        return
+    # Core statements on the table have no bind mapper
+    if (orm_execute_state.bind_mapper is Sensor.__mapper__ or
+            getattr(orm_execute_state.statement, 'table', None) is Sensor.__table__):
+        orm_execute_state.session.info['sensors_changed'] = True
+
+
+def _invalidate_sensor_list(session):
+    """Drop the cached sensor list and stats once sensor changes are committed."""
+    if session.info.pop('sensors_changed', False):
+        _get_sensors.cache_clear()
+        _compute_system_stats.cache_clear()
+
+
+@ttl_cache(SYSTEM_STATS_TTL)
+def _get_latest_status() -> Optional[SystemStatus]:
+    """Most recent system status row, detached so it can be cached."""
+    latest_status = SystemStatus.query.order_by(
+        SystemStatus.timestamp.desc()
+    ).first()
+    if latest_status is not None:
+        db.session.expunge(latest_status)
+    return latest_status
+
+
+@ttl_cache(SYSTEM_STATS_TTL)
+def _compute_system_stats() -> Tuple[Dict[str, Any], str]:
+    """
+    Build the /api/system/stats payload, minus its generation timestamp.
+    
+    Returns:
+        Tuple of (payload, etag)
+    """
+    sensors = _get_sensors()
+    total_sensors = len(sensors)
+    active_sensors = sum(1 for s in sensors if s.status == 'active')
+    
+    # Get the latest system status and the recent reading count in one
+    # round-trip; the sensor counts above come from the cached list
+    last_hour = datetime.now(timezone.utc) - timedelta(hours=1)
+    recent_count = select(func.count(SensorReading.id)).where(
+        SensorReading.timestamp >= last_hour
+    )
+    row = db.session.execute(
+        select(SystemStatus, recent_count.scalar_subquery())
+        .order_by(SystemStatus.timestamp.desc())
+        .limit(1)
+    ).first()
+    if row is not None:
+        latest_status, recent_readings = row
+    else:
+        latest_status = None
+        recent_readings = db.session.scalar(recent_count)
+    
+    payload = {
+        'total_sensors': total_sensors,
+        'active_sensors': active_sensors,
+        'error_sensors': total_sensors - active_sensors,
+        'recent_readings': recent_readings,
+        'system_status': latest_status.to_dict() if latest_status else None
+    }
+    return payload, make_etag(payload)
+
+
+def _note_status_flush(session, flush_context):
+    """Flag sessions that added system status rows."""
+    if any(isinstance(obj, SystemStatus) for obj in session.new):
+        session.info['status_changed'] = True
+
+
+def _invalidate_system_stats(session):
+    """Drop the cached status snapshot once a new status row is committed."""
+    if session.info.pop('status_changed', False):
+        _get_latest_status.cache_clear()
+        _compute_system_stats.cache_clear()
+
+
+def _forget_pending_changes(session):
+    session.info.pop('sensors_changed', None)
+    session.info.pop('status_changed', None)
+
+
+# Session events that keep the cached sensor list and status snapshot current
+_CACHE_LISTENERS = (
+    ('after_flush', _note_sensor_flush),
+    ('do_orm_execute', _note_sensor_statement),
+    ('after_commit', _invalidate_sensor_list),
+    ('after_flush', _note_status_flush),
+    ('after_commit', _invalidate_system_stats),
+    ('after_rollback', _forget_pending_changes),
+)
+
+
+def init_cache_invalidation() -> None:
+    """Listen for session commits that invalidate the page caches; idempotent."""
+    for identifier, listener in _CACHE_LISTENERS:
+        if not event.contains(Session, identifier, listener):
+            event.listen(Session, identifier, listener)
+
+
+class _ReadingPage:
+    """
+    One keyset page of readings, streamed from the database on iteration.
+    
+    The cursor for the following page is known once the rows have been
+    iterated, so templates read next_cursor after their loop.
+    """
+    
+    def __init__(self, result, page_size: int):
+        self._result = result
+        self._page_size = page_size
+        self._count = 0
+        self._last = None
+    
+    def __iter__(self):
+        for row in self._result:
+            self._count += 1
+            self._last = row
+            yield row
+    
+    @property
+    def next_cursor(self) -> Optional[Dict[str, Any]]:
+        """before_ts/before_id query arguments of the next page, if any."""
+        if self._count < self._page_size:
+            return None
+        return {
+            'before_ts': self._last.timestamp.isoformat(),
+            'before_id': self._last.id
+        }
+
+
+def _page_readings(query, page_size: int) -> _ReadingPage:
+    """
+    Query one page of readings, newest first, by keyset pagination.
+    
+    Args:
+        query: Select of SensorReading columns including timestamp and id
+        page_size: Maximum rows to return
+    
+    Returns:
+        Page whose rows are fetched in chunks as it is iterated
+    """
+    cursor = parse_keyset_cursor(request.args)
+    if cursor:
+        query = query.where(
+            tuple_(SensorReading.timestamp, SensorReading.id) < tuple_(*cursor)
+        )
+    result = db.session.execute(query.order_by(
+        SensorReading.timestamp.desc(), SensorReading.id.desc()
+    ).limit(page_size).execution_options(yield_per=STREAM_CHUNK_SIZE))
+    return _ReadingPage(result, page_size)
+
 
 @main_bp.route('/')
 def index():
     """Main dashboard page."""
     try:
         # Get all sensors
-        sensors = Sensor.query.all()
+        sensors = _get_sensors()
         
-        # Get real-time readings for each sensor (like the API does)
-        sensor_registry = SensorRegistry()
+        # Get real-time readings for each sensor (like the API does) from
+        # the background poller
+        live_readings = live_poller.readings(sensors)
         recent_readings = {}
         
+        # Stamp for readings that carry no timestamp of their own
+        now_ts = datetime.now(timezone.utc).timestamp()
+        
         for sensor in sensors:
+            if sensor.id not in live_readings:
+                continue
             try:
-                config = {'i2c_address': sensor.i2c_address}
-                if sensor.calibration_data:
-                    config.update(sensor.calibration_data)
+                # A read that raised is stored as its exception
+                reading = live_readings[sensor.id]
+                failed = isinstance(reading, Exception)
                 
-                sensor_class = sensor_registry.get_sensor_class(sensor.sensor_type)
-                if sensor_class:
-                    sensor_instance = sensor_class(sensor.id, config)
-                    reading = sensor_instance.read()
-                    
-                    if reading and 'error' not in reading:
-                        # Handle different sensor response formats
-                        if 'data' in reading:
-                            # BME280 format: nested data structure
-                            sensor_data = reading['data']
-                            timestamp = reading.get('timestamp')
-                            if isinstance(timestamp, datetime):
-                                timestamp = timestamp.timestamp()
-                        else:
-                            # LTR329/MPU6050 format: flat structure
-                            sensor_data = reading
-                            timestamp = reading.get('timestamp', datetime.now(timezone.utc).timestamp())
-                        
-                        recent_readings[sensor.id] = {
-                            'sensor_id': sensor.id,
-                            'sensor_type': sensor.sensor_type,
-                            'data': sensor_data,
-                            'timestamp': timestamp,
-                            'status': 'active'
-                        }
+                if not failed and reading and 'error' not in reading:
+                    # Handle different sensor response formats
+                    if 'data' in reading:
+                        # BME280 format: nested data structure
+                        sensor_data = reading['data']
+                        timestamp = reading.get('timestamp')
+                        if isinstance(timestamp, datetime):
+                            timestamp = timestamp.timestamp()
                     else:
-                        recent_readings[sensor.id] = {
-                            'sensor_id': sensor.id,
-                            'sensor_type': sensor.sensor_type,
-                            'data': {},
-                            'timestamp': datetime.now(timezone.utc).timestamp(),
-                            'status': 'error'
-                        }
-                        
+                        # LTR329/MPU6050 format: flat structure
+                        sensor_data = reading
+                        timestamp = reading.get('timestamp', now_ts)
+                
+                    recent_readings[sensor.id] = {
+                        'sensor_id': sensor.id,
+                        'sensor_type': sensor.sensor_type,
+                        'data': sensor_data,
+                        'timestamp': timestamp,
+                        'status': 'active'
+                    }
+                else:
+                    recent_readings[sensor.id] = {
+                        'sensor_id': sensor.id,
+                        'sensor_type': sensor.sensor_type,
+                        'data': {},
+                        'timestamp': now_ts,
+                        'status': 'error'
+                    }
+                
             except Exception as e:
                 logger.error(f"Error reading sensor {sensor.id}: {e}")
                 recent_readings[sensor.id] = {
                     'sensor_id': sensor.id,
                     'sensor_type': sensor.sensor_type,
                     'data': {},
-                    'timestamp': datetime.now(timezone.utc).timestamp(),
+                    'timestamp': now_ts,
                     'status': 'error'
                 }
         
-        # Calculate real-time status counts
+        # Sensors without a driver show their last stored reading, fetched
+        # for all of them in one query loading only the columns shown
+        stored_readings = {}
+        if len(recent_readings) < len(sensors):
+            stored_readings = SensorReading.latest_per_sensor(
+                SensorReading.timestamp, SensorReading.data)
+        
+        # Fill in stored readings and count real-time statuses in one pass
         status_counts = {
             'total': len(sensors),
             'active': 0,
@@ -83,17 +304,22 @@ def index():
         }
         
         for sensor in sensors:
-            if sensor.id in recent_readings:
-                status = recent_readings[sensor.id]['status']
-            else:
-                status = sensor.status
+            entry = recent_readings.get(sensor.id)
+            if entry is None:
+                stored = stored_readings.get(sensor.id)
+                if stored:
+                    entry = recent_readings[sensor.id] = {
+                        'sensor_id': sensor.id,
+                        'sensor_type': sensor.sensor_type,
+                        'data': stored.data or {},
+                        'timestamp': stored.timestamp.replace(
+                            tzinfo=timezone.utc).timestamp(),
+                        'status': sensor.status
+                    }
             
-            if status == 'active':
-                status_counts['active'] += 1
-            elif status == 'error':
-                status_counts['error'] += 1
-            elif status == 'unavailable':
-                status_counts['unavailable'] += 1
+            status = entry['status'] if entry else sensor.status
+            if status in ('active', 'error', 'unavailable'):
+                status_counts[status] += 1
         
         return render_template(
             'index.html',
@@ -117,7 +343,7 @@ def sensor_detail(sensor_id: str):
     """Detailed view for a specific sensor."""
     try:
         # Get sensor info
-        sensor = Sensor.query.filter_by(id=sensor_id).first()
+        sensor = db.session.get(Sensor, sensor_id)
         if not sensor:
             return render_template(
                 'error.html',
@@ -126,28 +352,32 @@ def sensor_detail(sensor_id: str):
             ), 404
         
         # Get recent readings
-        hours = request.args.get('hours', default=24, type=int)
-        if hours < 1 or hours > 168:  # Max 1 week
-            hours = 24
+        hours = parse_int_params(request.args, HOURS_PARAMS)['hours']
         
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours)
         
-        readings = SensorReading.query.filter(
-            SensorReading.sensor_id == sensor_id,
-            SensorReading.timestamp >= start_time
-        ).order_by(
-            SensorReading.timestamp.desc()
-        ).limit(1000).all()
+        # Plain rows skip ORM object hydration; the template reads their
+        # columns as attributes
+        page = _page_readings(
+            select(*SensorReading.dict_columns()).where(
+                SensorReading.sensor_id == sensor_id,
+                SensorReading.timestamp >= start_time
+            ),
+            SENSOR_DETAIL_PAGE_SIZE
+        )
         
-        # Convert readings to dictionaries for JSON serialization in JavaScript
-        readings_json = [reading.to_dict() for reading in readings]
+        # One list of dicts serves both the table and the chart data, which
+        # is encoded here rather than through Jinja's tojson
+        readings = [SensorReading.row_to_dict(row) for row in page]
+        readings_json = script_json(readings)
         
         return render_template(
             'sensor_detail.html',
             sensor=sensor,
             readings=readings,
             readings_json=readings_json,
+            next_cursor=page.next_cursor,
             hours=hours,
             page_title=f'Sensor: {sensor.name or sensor_id}'
         )
@@ -166,31 +396,28 @@ def data_view():
     """Data exploration and export page."""
     try:
         # Get all sensors for filter options
-        sensors = Sensor.query.all()
+        sensors = _get_sensors()
         
         # Get query parameters
         sensor_filter = request.args.get('sensor')
-        hours = request.args.get('hours', default=24, type=int)
-        
-        if hours < 1 or hours > 168:
-            hours = 24
+        hours = parse_int_params(request.args, HOURS_PARAMS)['hours']
         
         # Build query
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=hours)
         
-        query = SensorReading.query.filter(
+        query = select(*SensorReading.dict_columns()).where(
             SensorReading.timestamp >= start_time
         )
         
         if sensor_filter:
-            query = query.filter(SensorReading.sensor_id == sensor_filter)
+            query = query.where(SensorReading.sensor_id == sensor_filter)
         
-        readings = query.order_by(
-            SensorReading.timestamp.desc()
-        ).limit(5000).all()
+        # Rows stream from the database while the template iterates them,
+        # and the rendered page is sent in pieces as it is produced
+        readings = _page_readings(query, DATA_VIEW_PAGE_SIZE)
         
-        return render_template(
+        return stream_template(
             'data.html',
             sensors=sensors,
             readings=readings,
@@ -213,33 +440,29 @@ def system_status():
     """System status and health page."""
     try:
         # Get latest system status
-        latest_status = SystemStatus.query.order_by(
-            SystemStatus.timestamp.desc()
-        ).first()
+        latest_status = _get_latest_status()
         
         # Get sensor statistics
-        sensors = Sensor.query.all()
+        sensors = _get_sensors()
+        status_counts = Counter(s.status for s in sensors)
         sensor_stats = {
             'total': len(sensors),
-            'active': len([s for s in sensors if s.status == 'active']),
-            'error': len([s for s in sensors if s.status == 'error']),
-            'unavailable': len([s for s in sensors if s.status == 'unavailable'])
+            'active': status_counts['active'],
+            'error': status_counts['error'],
+            'unavailable': status_counts['unavailable']
         }
         
-        # Get reading statistics for the last 24 hours
+        # Get readings per sensor for the last 24 hours in one query; the
+        # total is their sum
         one_day_ago = datetime.now(timezone.utc) - timedelta(hours=24)
-        recent_readings = SensorReading.query.filter(
+        rows = db.session.query(
+            SensorReading.sensor_id, func.count(SensorReading.id)
+        ).filter(
             SensorReading.timestamp >= one_day_ago
-        ).count()
-        
-        # Get readings per sensor
-        readings_per_sensor = {}
-        for sensor in sensors:
-            count = SensorReading.query.filter(
-                SensorReading.sensor_id == sensor.id,
-                SensorReading.timestamp >= one_day_ago
-            ).count()
-            readings_per_sensor[sensor.id] = count
+        ).group_by(SensorReading.sensor_id).all()
+        recent_readings = sum(count for _, count in rows)
+        readings_per_sensor = dict.fromkeys((s.id for s in sensors), 0)
+        readings_per_sensor.update(rows)
         
         return render_template(
             'status.html',
@@ -283,8 +506,8 @@ def dashboard():
 def api_current_sensors():
     """API endpoint for current sensor data."""
     try:
-        sensors = Sensor.query.all()
-        sensor_registry = SensorRegistry()
+        sensors = _get_sensors()
+        live_readings = live_poller.readings(sensors)
         
         result = {
             'sensors': [],
@@ -301,18 +524,14 @@ def api_current_sensors():
                 'latest_reading': None
             }
             
-            # Get real-time reading
+            # Get real-time reading; a read that raised is stored as its
+            # exception
             try:
-                config = {'i2c_address': sensor.i2c_address}
-                if sensor.calibration_data:
-                    config.update(sensor.calibration_data)
-                
-                sensor_class = sensor_registry.get_sensor_class(sensor.sensor_type)
-                if sensor_class:
-                    sensor_instance = sensor_class(sensor.id, config)
-                    reading = sensor_instance.read()
+                if sensor.id in live_readings:
+                    reading = live_readings[sensor.id]
+                    failed = isinstance(reading, Exception)
                     
-                    if reading and 'error' not in reading:
+                    if not failed and reading and 'error' not in reading:
                         sensor_data['latest_reading'] = reading
                         sensor_data['status'] = 'active'
                     else:
@@ -324,7 +543,9 @@ def api_current_sensors():
             
             result['sensors'].append(sensor_data)
         
-        return jsonify(result)
+        # Dashboards poll this; answer 304 until a poll changes a reading
+        return conditional_response(make_etag(result['sensors']),
+                                    lambda: jsonify(result))
         
     except Exception as e:
         logger.error(f"Error in API endpoint: {e}")
@@ -338,21 +559,39 @@ def api_sensor_history(sensor_id: str):
         # Get time range from query parameters
         hours = request.args.get('hours', 24, type=int)
         start_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-        
-        # Get historical readings
-        readings = SensorReading.query.filter(
+        in_range = (
             SensorReading.sensor_id == sensor_id,
             SensorReading.timestamp >= start_time
-        ).order_by(SensorReading.timestamp.desc()).limit(100).all()
+        )
         
-        result = {
-            'sensor_id': sensor_id,
-            'readings': [reading.to_dict() for reading in reversed(readings)],
-            'count': len(readings),
-            'time_range_hours': hours
-        }
+        # New readings move the latest timestamp and id; readings leaving
+        # the window move the count
+        count, last_timestamp, last_id = db.session.execute(
+            select(func.count(SensorReading.id),
+                   func.max(SensorReading.timestamp),
+                   func.max(SensorReading.id)).where(*in_range)
+        ).one()
+        etag = make_etag(sensor_id, hours, count, last_timestamp, last_id)
+        
+        def build():
+            # Get the latest 100 readings as plain rows, put back in
+            # chronological order by the database
+            latest = select(*SensorReading.dict_columns()).where(
+                *in_range
+            ).order_by(SensorReading.timestamp.desc()).limit(100).subquery()
+            readings = list(SensorReading.iter_dicts(
+                select(latest).order_by(latest.c.timestamp), isoformat=False
+            ))
+            
+            # Serialized once with orjson rather than through jsonify
+            return json_response({
+                'sensor_id': sensor_id,
+                'readings': readings,
+                'count': len(readings),
+                'time_range_hours': hours
+            })
         
-        return jsonify(result)
+        return conditional_response(etag, build)
         
     except Exception as e:
         logger.error(f"Error getting sensor history: {e}")
@@ -363,47 +602,20 @@ def api_sensor_history(sensor_id: str):
 def api_system_stats():
     """API endpoint for system statistics."""
     try:
-        sensors = Sensor.query.all()
-        total_sensors = len(sensors)
-        active_sensors = len([s for s in sensors if s.status == 'active'])
+        payload, etag = _compute_system_stats()
         
-        # Get recent reading count
-        last_hour = datetime.now(timezone.utc) - timedelta(hours=1)
-        recent_readings = SensorReading.query.filter(
-            SensorReading.timestamp >= last_hour
-        ).count()
+        def build():
+            result = dict(payload)
+            result['timestamp'] = datetime.now(timezone.utc).isoformat()
+            return jsonify(result)
         
-        # Get system status
-        latest_status = SystemStatus.query.order_by(
-            SystemStatus.timestamp.desc()
-        ).first()
-        
-        result = {
-            'total_sensors': total_sensors,
-            'active_sensors': active_sensors,
-            'error_sensors': total_sensors - active_sensors,
-            'recent_readings': recent_readings,
-            'system_status': latest_status.to_dict() if latest_status else None,
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        }
-        
-        return jsonify(result)
+        return conditional_response(etag, build)
         
     except Exception as e:
         logger.error(f"Error getting system stats: {e}")
         return jsonify({'error': str(e)}), 500
 
 
-@main_bp.errorhandler(404)
-def not_found(error):
-    """Handle 404 errors."""
-    return render_template(
-        'error.html',
-        error="Page not found",
-        page_title='Not Found'
-    ), 404
-
-
 @main_bp.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
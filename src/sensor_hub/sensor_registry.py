@@ -1,15 +1,58 @@
 """Sensor registry and auto-detection system."""
 
 import logging
-from typing import Dict, Type, List, Optional, Any
+from typing import Dict, Iterable, Type, List, Optional, Any
 from abc import ABC
 import importlib
 import inspect
 
+try:
+    import smbus2 as smbus
+except ImportError:
+    smbus = None
+
 from sensor_hub.sensors import SensorInterface
 
 logger = logging.getLogger(__name__)
 
+# I2C addresses each supported device can be strapped to
+PCA9548_ADDRS = frozenset(range(0x70, 0x78))
+BME280_ADDRS = frozenset((0x76, 0x77))
+LTR329_ADDRS = frozenset((0x29,))
+MPU6050_ADDRS = frozenset((0x68, 0x69))
+
+# PCA9548 control register values selecting each of channels 0-7
+_MUX_MASKS = tuple(1 << channel for channel in range(8))
+
+
+def _scan_i2c_bus(bus, addresses: Iterable[int]) -> List[int]:
+    """
+    Probe I2C addresses in-process, the way ``i2cdetect -y`` does.
+    
+    Addresses in the EEPROM-style ranges are probed with a read, like
+    i2cdetect, since a quick write can disturb those devices; all others
+    with a quick write. Addresses claimed by a kernel driver fail the probe
+    and are skipped, as i2cdetect's "UU" cells were.
+    
+    Args:
+        bus: Open SMBus handle of the bus to scan
+        addresses: Addresses to probe, in scan order
+    
+    Returns:
+        Addresses that acknowledged the probe
+    """
+    detected = []
+    for addr in addresses:
+        try:
+            if 0x30 <= addr <= 0x37 or 0x50 <= addr <= 0x5F:
+                bus.read_byte(addr)
+            else:
+                bus.write_quick(addr)
+        except OSError:
+            continue
+        detected.append(addr)
+    return detected
+
 
 class SensorRegistry:
     """Registry for all available sensor types."""
@@ -17,6 +60,8 @@ class SensorRegistry:
     def __init__(self):
         self._sensor_classes: Dict[str, Type[SensorInterface]] = {}
         self._discovery_handlers: Dict[str, callable] = {}
+        # Snapshot of registered type names, rebuilt only on registration
+        self._available_types: List[str] = []
         self._register_builtin_sensors()
     
     def register_sensor(self, sensor_type: str, sensor_class: Type[SensorInterface]):
@@ -25,6 +70,7 @@ class SensorRegistry:
             raise ValueError(f"Sensor class {sensor_class} must inherit from SensorInterface")
         
         self._sensor_classes[sensor_type.lower()] = sensor_class
+        self._available_types = list(self._sensor_classes)
         logger.info(f"Registered sensor type: {sensor_type}")
     
     def register_discovery_handler(self, sensor_type: str, handler: callable):
@@ -34,11 +80,19 @@ class SensorRegistry:
     
     def get_sensor_class(self, sensor_type: str) -> Optional[Type[SensorInterface]]:
         """Get sensor class by type."""
-        return self._sensor_classes.get(sensor_type.lower())
+        # Types are registered lowercased and stored that way on sensor rows,
+        # so only lowercase the name when the direct lookup misses
+        sensor_class = self._sensor_classes.get(sensor_type)
+        if sensor_class is None:
+            sensor_class = self._sensor_classes.get(sensor_type.lower())
+        return sensor_class
     
     def get_available_types(self) -> List[str]:
-        """Get list of available sensor types."""
-        return list(self._sensor_classes.keys())
+        """Get list of available sensor types.
+        
+        The list is shared between calls and must not be modified.
+        """
+        return self._available_types
     
     def create_sensor(self, sensor_type: str, sensor_id: str, config: Dict[str, Any]) -> Optional[SensorInterface]:
         """Create a sensor instance."""
@@ -80,131 +134,117 @@ class SensorRegistry:
             logger.warning(f"MPU6050 sensor not available: {e}")
     
     def discover_sensors(self) -> List[Dict[str, Any]]:
-        """Discover all available sensors on the system."""
+        """Discover all available sensors on the system.
+        
+        I2C bus 1 is opened once and handed to every handler that takes a
+        ``bus`` argument; other handlers are called without arguments.
+        """
         discovered_sensors = []
         
-        for sensor_type, handler in self._discovery_handlers.items():
+        bus = None
+        if smbus is None:
+            logger.warning("smbus2 not available for I2C discovery")
+        else:
             try:
-                sensors = handler()
-                for sensor_info in sensors:
-                    sensor_info['sensor_type'] = sensor_type
-                    discovered_sensors.append(sensor_info)
-            except Exception as e:
-                logger.error(f"Error discovering {sensor_type} sensors: {e}")
+                bus = smbus.SMBus(1)
+            except OSError as e:
+                logger.warning(f"I2C bus 1 not available for discovery: {e}")
+        
+        try:
+            for sensor_type, handler in self._discovery_handlers.items():
+                try:
+                    if 'bus' in inspect.signature(handler).parameters:
+                        if bus is None:
+                            continue
+                        sensors = handler(bus=bus)
+                    else:
+                        sensors = handler()
+                    for sensor_info in sensors:
+                        sensor_info['sensor_type'] = sensor_type
+                        discovered_sensors.append(sensor_info)
+                except Exception as e:
+                    logger.error(f"Error discovering {sensor_type} sensors: {e}")
+        finally:
+            if bus is not None:
+                bus.close()
         
         logger.info(f"Discovered {len(discovered_sensors)} sensors")
         return discovered_sensors
     
-    def _discover_bme280(self) -> List[Dict[str, Any]]:
+    def _discover_bme280(self, bus) -> List[Dict[str, Any]]:
         """Discover BME280 sensors on I2C bus and behind PCA9548 multiplexers."""
         sensors = []
         
         try:
-            import subprocess
-            result = subprocess.run(['i2cdetect', '-y', '1'], 
-                                  capture_output=True, text=True, timeout=10)
+            # Only multiplexer and BME280 addresses matter here; the BME280
+            # addresses 0x76/0x77 fall inside the PCA9548 range
+            detected_addresses = _scan_i2c_bus(bus, sorted(PCA9548_ADDRS))
             
-            if result.returncode == 0:
-                # Parse i2cdetect output
-                lines = result.stdout.split('\n')[1:]  # Skip header
-                detected_addresses = []
-                
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) < 2:
-                        continue
-                    
-                    row_addr = int(parts[0][:-1], 16)  # Remove ':' and convert
+            # Ensure all PCA9548 channels are disabled before direct scans
+            self._disable_all_multiplexers(bus, detected_addresses)
+            
+            # First, identify multiplexers and scan their channels
+            # Then check for direct BME280 connections on remaining addresses
+            multiplexer_addresses = []
+            for mux_addr in detected_addresses:
+                if mux_addr in PCA9548_ADDRS:
+                    # Try to verify it's actually a multiplexer by testing channel selection
+                    if self._verify_pca9548(bus, mux_addr):
+                        multiplexer_addresses.append(mux_addr)
+                        # Scan multiplexer channels for BME280 sensors
+                        mux_sensors = self._scan_pca9548_channels(bus, mux_addr)
+                        sensors.extend(mux_sensors)
+            
+            # Check for direct BME280 connections (excluding confirmed multiplexers)
+            for addr in detected_addresses:
+                if addr in BME280_ADDRS and addr not in multiplexer_addresses:
+                    sensors.append({
+                        'sensor_id': f'bme280_{addr:02x}',
+                        'name': f'BME280 Sensor (0x{addr:02x})',
+                        'config': {
+                            'i2c_address': addr,
+                            'bus_number': 1
+                        },
+                        'location': 'I2C Direct',
+                        'description': 'Temperature, humidity, pressure sensor'
+                    })
                     
-                    for col, cell in enumerate(parts[1:], 0):
-                        if cell != '--' and cell != 'UU':
-                            addr = row_addr + col
-                            detected_addresses.append(addr)
-                
-                # Ensure all PCA9548 channels are disabled before direct scans
-                self._disable_all_multiplexers(detected_addresses)
-                
-                # First, identify multiplexers and scan their channels
-                # Then check for direct BME280 connections on remaining addresses
-                multiplexer_addresses = []
-                pca9548_addresses = [0x70, 0x71, 0x72, 0x73, 0x74, 0x75, 0x76, 0x77]
-                for mux_addr in detected_addresses:
-                    if mux_addr in pca9548_addresses:
-                        # Try to verify it's actually a multiplexer by testing channel selection
-                        if self._verify_pca9548(mux_addr):
-                            multiplexer_addresses.append(mux_addr)
-                            # Scan multiplexer channels for BME280 sensors
-                            mux_sensors = self._scan_pca9548_channels(mux_addr)
-                            sensors.extend(mux_sensors)
-                
-                # Check for direct BME280 connections (excluding confirmed multiplexers)
-                bme280_addresses = [0x76, 0x77]  # Re-added 0x77 for discovery
-                for addr in detected_addresses:
-                    if addr in bme280_addresses and addr not in multiplexer_addresses:
-                        sensors.append({
-                            'sensor_id': f'bme280_{addr:02x}',
-                            'name': f'BME280 Sensor (0x{addr:02x})',
-                            'config': {
-                                'i2c_address': addr,
-                                'bus_number': 1
-                            },
-                            'location': 'I2C Direct',
-                            'description': 'Temperature, humidity, pressure sensor'
-                        })
-                        
         except Exception as e:
             logger.debug(f"I2C detection failed for BME280: {e}")
         
         return sensors
 
-    def _disable_all_multiplexers(self, addresses: List[int]):
+    def _disable_all_multiplexers(self, bus, addresses: List[int]):
         """Disable all channels on detected PCA9548 multiplexers."""
-        try:
-            import smbus2 as smbus
-            bus = smbus.SMBus(1)
-            
-            pca9548_addresses = [0x70, 0x71, 0x72, 0x73, 0x74, 0x75, 0x76, 0x77]
-            for addr in addresses:
-                if addr in pca9548_addresses:
-                    try:
-                        bus.write_byte(addr, 0x00)  # Disable all channels
-                    except Exception:
-                        pass  # Ignore if not a multiplexer
-            bus.close()
-        except Exception:
-            pass
+        for addr in addresses:
+            if addr in PCA9548_ADDRS:
+                try:
+                    bus.write_byte(addr, 0x00)  # Disable all channels
+                except Exception:
+                    pass  # Ignore if not a multiplexer
 
-    def _verify_pca9548(self, address: int) -> bool:
+    def _verify_pca9548(self, bus, address: int) -> bool:
         """Verify if an address is actually a PCA9548 multiplexer."""
         try:
-            import smbus2 as smbus
-            bus = smbus.SMBus(1)
-            
-            # Try to select channel 0, then disable all channels
-            # PCA9548 should respond without error
-            bus.write_byte(address, 0x01)  # Select channel 0
-            bus.write_byte(address, 0x00)  # Disable all channels
-            bus.close()
+            # A PCA9548 answers a plain read with its control register;
+            # unlike a select write this leaves the channel state untouched
+            bus.read_byte(address)
             return True
-        except Exception:
+        except OSError:
             return False
 
-    def _scan_pca9548_channels(self, mux_address: int) -> List[Dict[str, Any]]:
+    def _scan_pca9548_channels(self, bus, mux_address: int) -> List[Dict[str, Any]]:
         """Scan PCA9548 multiplexer channels for BME280 sensors."""
         sensors = []
         
         try:
-            import smbus2 as smbus
-            import time
+            bme280_addresses = sorted(BME280_ADDRS)
             
-            bus = smbus.SMBus(1)
-            bme280_addresses = [0x76, 0x77]  # Re-added 0x77 for discovery
-            
-            for channel in range(8):
+            for channel, mask in enumerate(_MUX_MASKS):
                 try:
-                    # Select channel on multiplexer
-                    bus.write_byte(mux_address, 1 << channel)
-                    time.sleep(0.05)  # Small delay for channel selection
+                    # Select channel on multiplexer; the PCA9548 connects it
+                    # at the STOP ending this write, so no settle delay is needed
+                    bus.write_byte(mux_address, mask)
                     
                     # Check for BME280 on this channel
                     for bme_addr in bme280_addresses:
@@ -234,60 +274,34 @@ class SensorRegistry:
             
             # Reset multiplexer (disable all channels)
             bus.write_byte(mux_address, 0x00)
-            bus.close()
             
         except Exception as e:
             logger.debug(f"Error scanning PCA9548 at 0x{mux_address:02x}: {e}")
         
         return sensors
 
-    def _discover_ltr329(self) -> List[Dict[str, Any]]:
+    def _discover_ltr329(self, bus) -> List[Dict[str, Any]]:
         """Discover LTR-329 ambient light sensors on I2C bus and MUX."""
         discovered_sensors = []
         
         try:
-            import subprocess
-            import smbus2 as smbus
-            import time
-            
-            # Get list of devices on I2C bus 1
-            result = subprocess.run(['i2cdetect', '-y', '1'],
-                                    capture_output=True, text=True, timeout=10)
-            
-            if result.returncode != 0:
-                logger.warning("Could not run i2cdetect to scan for sensors")
-                return discovered_sensors
-            
-            # Parse i2cdetect output to find devices
-            output_lines = result.stdout.strip().split('\n')[1:]  # Skip header
-            detected_addresses = []
-            
-            for line in output_lines:
-                parts = line.split()
-                if len(parts) > 1:
-                    for addr_str in parts[1:]:  # Skip row label
-                        if addr_str != '--' and addr_str != 'UU':
-                            try:
-                                addr = int(addr_str, 16)
-                                detected_addresses.append(addr)
-                            except ValueError:
-                                pass
+            # Probe the LTR-329 and multiplexer addresses on I2C bus 1
+            detected_addresses = _scan_i2c_bus(
+                bus, sorted(LTR329_ADDRS | PCA9548_ADDRS))
             
             addr_list = [hex(addr) for addr in detected_addresses]
             logger.debug(f"Detected I2C addresses: {addr_list}")
             
             # Look for LTR-329 at standard addresses (0x29)
-            ltr329_addresses = [0x29]
+            ltr329_addresses = sorted(LTR329_ADDRS)
             
             # First check for direct connections
             for addr in detected_addresses:
-                if addr in ltr329_addresses:
+                if addr in LTR329_ADDRS:
                     # Try to verify it's actually an LTR-329
                     try:
-                        bus = smbus.SMBus(1)
                         # Try to read the Part ID register
                         part_id = bus.read_byte_data(addr, 0x86)
-                        bus.close()
                         
                         # Verify it's an LTR-329 (Part ID should be 0xA0)
                         if part_id == 0xA0:
@@ -309,23 +323,17 @@ class SensorRegistry:
                         )
             
             # Check multiplexer channels for LTR-329 sensors
-            multiplexer_addresses = [
-                0x70, 0x71, 0x72, 0x73, 0x74, 0x75, 0x76, 0x77
-            ]
-            
             for mux_addr in detected_addresses:
-                if mux_addr in multiplexer_addresses:
+                if mux_addr in PCA9548_ADDRS:
                     logger.debug(f"Scanning multiplexer at 0x{mux_addr:02x} for LTR-329 sensors")
                     
                     try:
-                        bus = smbus.SMBus(1)
-                        
                         # Scan each channel (0-7)
-                        for channel in range(8):
+                        for channel, mask in enumerate(_MUX_MASKS):
                             try:
-                                # Select channel
-                                bus.write_byte(mux_addr, 1 << channel)
-                                time.sleep(0.01)
+                                # Select channel; it is connected at the
+                                # STOP ending this write
+                                bus.write_byte(mux_addr, mask)
                                 
                                 # Check for LTR-329 at standard address
                                 for ltr_addr in ltr329_addresses:
@@ -358,65 +366,37 @@ class SensorRegistry:
                         
                         # Reset multiplexer (disable all channels)
                         bus.write_byte(mux_addr, 0x00)
-                        bus.close()
                         
                     except Exception as e:
                         logger.debug(f"Error scanning multiplexer at 0x{mux_addr:02x}: {e}")
                         
-        except ImportError:
-            logger.warning("smbus2 not available for LTR-329 discovery")
         except Exception as e:
             logger.debug(f"Error during LTR-329 discovery: {e}")
         
         return discovered_sensors
 
-    def _discover_mpu6050(self) -> List[Dict[str, Any]]:
+    def _discover_mpu6050(self, bus) -> List[Dict[str, Any]]:
         """Discover MPU-6050 6-axis IMU sensors on I2C bus and MUX."""
         discovered_sensors = []
         
         try:
-            import subprocess
-            import smbus2 as smbus
-            import time
-            
-            # Get list of devices on I2C bus 1
-            result = subprocess.run(['i2cdetect', '-y', '1'],
-                                    capture_output=True, text=True, timeout=10)
-            
-            if result.returncode != 0:
-                logger.warning("Could not run i2cdetect to scan for sensors")
-                return discovered_sensors
-            
-            # Parse i2cdetect output to find devices
-            output_lines = result.stdout.strip().split('\n')[1:]  # Skip header
-            detected_addresses = []
-            
-            for line in output_lines:
-                parts = line.split()
-                if len(parts) > 1:
-                    for addr_str in parts[1:]:  # Skip row label
-                        if addr_str != '--' and addr_str != 'UU':
-                            try:
-                                addr = int(addr_str, 16)
-                                detected_addresses.append(addr)
-                            except ValueError:
-                                pass
+            # Probe the MPU-6050 and multiplexer addresses on I2C bus 1
+            detected_addresses = _scan_i2c_bus(
+                bus, sorted(MPU6050_ADDRS | PCA9548_ADDRS))
             
             addr_list = [hex(addr) for addr in detected_addresses]
             logger.debug(f"Detected I2C addresses: {addr_list}")
             
             # Look for MPU-6050 at standard addresses (0x68, 0x69)
-            mpu6050_addresses = [0x68, 0x69]
+            mpu6050_addresses = sorted(MPU6050_ADDRS)
             
             # First check for direct connections
             for addr in detected_addresses:
-                if addr in mpu6050_addresses:
+                if addr in MPU6050_ADDRS:
                     # Try to verify it's actually an MPU-6050
                     try:
-                        bus = smbus.SMBus(1)
                         # Try to read the WHO_AM_I register
                         who_am_i = bus.read_byte_data(addr, 0x75)
-                        bus.close()
                         
                         # Verify it's an MPU-6050 (WHO_AM_I should be 0x68)
                         if who_am_i == 0x68:
@@ -442,23 +422,17 @@ class SensorRegistry:
                         )
             
             # Check multiplexer channels for MPU-6050 sensors
-            multiplexer_addresses = [
-                0x70, 0x71, 0x72, 0x73, 0x74, 0x75, 0x76, 0x77
-            ]
-            
             for mux_addr in detected_addresses:
-                if mux_addr in multiplexer_addresses:
+                if mux_addr in PCA9548_ADDRS:
                     logger.debug(f"Scanning MUX 0x{mux_addr:02x} for MPU-6050")
                     
                     try:
-                        bus = smbus.SMBus(1)
-                        
                         # Scan each channel (0-7)
-                        for channel in range(8):
+                        for channel, mask in enumerate(_MUX_MASKS):
                             try:
-                                # Select channel
-                                bus.write_byte(mux_addr, 1 << channel)
-                                time.sleep(0.01)
+                                # Select channel; it is connected at the
+                                # STOP ending this write
+                                bus.write_byte(mux_addr, mask)
                                 
                                 # Check for MPU-6050 at standard addresses
                                 for mpu_addr in mpu6050_addresses:
@@ -504,13 +478,10 @@ class SensorRegistry:
                         
                         # Reset multiplexer (disable all channels)
                         bus.write_byte(mux_addr, 0x00)
-                        bus.close()
                         
                     except Exception as e:
                         logger.debug(f"Error scanning MUX 0x{mux_addr:02x}: {e}")
                         
-        except ImportError:
-            logger.warning("smbus2 not available for MPU-6050 discovery")
         except Exception as e:
             logger.debug(f"Error during MPU-6050 discovery: {e}")
         
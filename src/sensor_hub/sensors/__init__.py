@@ -1,8 +1,10 @@
 """Base sensor interface for Sensor Hub."""
 
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 import logging
+import random
 
 logger = logging.getLogger(__name__)
 
@@ -71,9 +73,6 @@ class MockSensor(SensorInterface):
         
     def read(self) -> Dict[str, Any]:
         """Return mock sensor data."""
-        import random
-        from datetime import datetime, timezone
-        
         data = {
             'temperature': round(random.uniform(18.0, 28.0), 2),
             'humidity': round(random.uniform(40.0, 80.0), 2),
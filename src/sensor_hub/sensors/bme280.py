@@ -1,7 +1,9 @@
 """BME280 temperature, humidity, and pressure sensor implementation."""
 
+from datetime import datetime, timezone
 from typing import Dict, Any
 import logging
+import math
 
 try:
     import board
@@ -23,6 +25,10 @@ logger = logging.getLogger(__name__)
 class BME280Sensor(SensorInterface):
     """BME280 environmental sensor implementation."""
     
+    # Magnus formula coefficients for the dew point
+    MAGNUS_A = 17.27
+    MAGNUS_B = 237.7
+    
     def __init__(self, sensor_id: str, config: Dict[str, Any]):
         super().__init__(sensor_id, config)
         self.i2c_address = config.get('i2c_address', 0x76)  # Default changed
@@ -81,8 +87,6 @@ class BME280Sensor(SensorInterface):
             if self.mux_address is not None:
                 self._select_mux_channel()
             
-            from datetime import datetime, timezone
-            
             temperature = round(self.bme280.temperature, 2)
             humidity = round(self.bme280.relative_humidity, 2)
             pressure = round(self.bme280.pressure, 2)
@@ -132,19 +136,13 @@ class BME280Sensor(SensorInterface):
     
     def _calculate_dew_point(self, temperature: float, humidity: float) -> float:
         """Calculate dew point using Magnus formula."""
-        import math
-        
         if humidity <= 0:
             return 0.0
-            
+        
+        a = self.MAGNUS_A
+        b = self.MAGNUS_B
         try:
-            # Magnus formula coefficients
-            a = 17.27
-            b = 237.7
-            
-            alpha = ((a * temperature) / (b + temperature)) + math.log(humidity / 100.0)
-            dew_point = (b * alpha) / (a - alpha)
-            
-            return round(dew_point, 2)
-        except (ValueError, ZeroDivisionError):
+            alpha = (a * temperature) / (b + temperature) + math.log(humidity * 0.01)
+            return round((b * alpha) / (a - alpha), 2)
+        except ZeroDivisionError:
             return 0.0
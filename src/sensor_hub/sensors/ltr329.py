@@ -3,6 +3,7 @@
 
 from typing import Dict, Any
 import logging
+import math
 import time
 import random
 
@@ -139,8 +140,6 @@ class LTR329Sensor(SensorInterface):
     
     def _read_mock_lux_and_ir(self) -> tuple[float, float]:
         """Generate realistic mock visible+IR and IR readings as raw values."""
-        import math
-        
         # Simulate day/night cycle with some randomness
         current_time = time.time() + self._mock_time_offset
         
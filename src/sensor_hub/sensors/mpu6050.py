@@ -2,6 +2,7 @@
 
 from typing import Dict, Any
 import logging
+import random
 import time
 
 try:
@@ -167,8 +168,6 @@ class MPU6050Sensor(SensorInterface):
 
     def _get_mock_reading(self) -> Dict[str, Any]:
         """Generate mock reading for testing."""
-        import random
-        
         return {
             'accel_x': round(random.uniform(-1.0, 1.0), 3),
             'accel_y': round(random.uniform(-1.0, 1.0), 3),
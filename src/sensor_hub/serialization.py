@@ -0,0 +1,137 @@
+"""JSON serialization helpers for API responses."""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable
+
+from flask import Response, current_app, request, stream_with_context
+from markupsafe import Markup
+
+# Number of list items encoded per streamed chunk
+STREAM_CHUNK_SIZE = 500
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _default(obj: Any) -> Any:
+    # Match orjson, which writes datetimes as isoformat() strings
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return current_app.json.default(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON bytes, using orjson when available.
+    
+    Datetimes are encoded as their isoformat() strings either way.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return current_app.json.dumps(obj, default=_default).encode('utf-8')
+
+
+def script_json(obj: Any) -> Markup:
+    """
+    Serialize an object once for embedding in an HTML <script> block.
+    
+    Escapes the same characters as Jinja's tojson filter, so the result can
+    be rendered directly without a second encoding pass in the template.
+    """
+    text = dumps(obj).decode('utf-8')
+    return Markup(
+        text.replace('<', '\\u003c')
+        .replace('>', '\\u003e')
+        .replace('&', '\\u0026')
+        .replace("'", '\\u0027')
+    )
+
+
+def column_dumps(obj: Any) -> str:
+    """Serialize a JSON column value with orjson; used as the engine's json_serializer."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+
+def column_loads(value: str) -> Any:
+    """Parse a JSON column value with orjson; used as the engine's json_deserializer."""
+    return orjson.loads(value)
+
+
+# Engine options that route JSON columns through orjson when it is installed
+JSON_ENGINE_OPTIONS: Dict[str, Any] = (
+    {'json_serializer': column_dumps, 'json_deserializer': column_loads}
+    if HAS_ORJSON else {}
+)
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """Build a JSON response from an object without going through jsonify."""
+    return Response(dumps(obj), status=status, mimetype='application/json')
+
+
+def stream_list_response(
+    key: str,
+    items: Iterable[Any],
+    trailer: Callable[[int], Dict[str, Any]]
+) -> Response:
+    """
+    Stream a JSON object whose first member is a list, without building it.
+    
+    Args:
+        key: Name of the list member
+        items: Items to encode into the list, consumed lazily
+        trailer: Called with the item count once the list is exhausted;
+            its keys are appended after the list
+    
+    Returns:
+        Streaming response producing ``{"<key>": [...], **trailer(count)}``
+    """
+    def encode_chunk(chunk, first):
+        # One encoder call per chunk; strip the list brackets to splice it in
+        return (b'' if first else b',') + dumps(chunk)[1:-1]
+    
+    def generate():
+        count = 0
+        chunk = []
+        yield b'{' + dumps(key) + b':['
+        for item in items:
+            chunk.append(item)
+            count += 1
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield encode_chunk(chunk, count == len(chunk))
+                chunk = []
+        if chunk:
+            yield encode_chunk(chunk, count == len(chunk))
+        
+        tail = dumps(trailer(count))
+        yield b']' + (b',' + tail[1:] if tail != b'{}' else b'}')
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+def make_etag(*parts: Any) -> str:
+    """Derive a strong ETag from values that change whenever the payload does."""
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+
+def conditional_response(etag: str, build: Callable[[], Response]) -> Response:
+    """
+    Answer a GET with 304 when the client already holds the current ETag.
+    
+    Args:
+        etag: Current entity tag of the resource
+        build: Produces the full response; only called on a cache miss
+    
+    Returns:
+        Empty 304 response or the built response, both carrying the ETag
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = build()
+    response.set_etag(etag)
+    return response
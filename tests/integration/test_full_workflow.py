@@ -108,6 +108,66 @@ class TestFullApplicationWorkflow:
             response = client.get('/data')
             assert response.status_code == 200
 
+    def test_data_view_streams_keyset_pages(self, app, client):
+        """Test the data page streams and links to the next older page."""
+        with app.app_context():
+            sensor = Sensor(id='paged_sensor', name='Paged Sensor',
+                            sensor_type='bme280', enabled=True)
+            db.session.add(sensor)
+            now = datetime.now(timezone.utc)
+            for minutes in range(3):
+                db.session.add(SensorReading(
+                    sensor_id=sensor.id,
+                    sensor_type=sensor.sensor_type,
+                    timestamp=now - timedelta(minutes=minutes),
+                    temperature=20.0,
+                    data={}
+                ))
+            db.session.commit()
+            
+            with patch('sensor_hub.routes.DATA_VIEW_PAGE_SIZE', 2):
+                response = client.get(f'/data?sensor={sensor.id}')
+                assert response.is_streamed
+                body = response.get_data(as_text=True)
+                assert response.status_code == 200
+                assert body.count('<td>paged_sensor</td>') == 2
+                assert 'before_id=' in body
+                
+                cursor = body.split('href="/data?', 1)[1].split('"', 1)[0]
+                response = client.get('/data?' + cursor.replace('&amp;', '&'))
+                body = response.get_data(as_text=True)
+                assert body.count('<td>paged_sensor</td>') == 1
+                assert 'before_id=' not in body
+
+    def test_data_view_pages_default_timestamps(self, app, client):
+        """Test keyset paging over readings timestamped by the database."""
+        with app.app_context():
+            sensor = Sensor(id='default_ts_sensor', name='Default TS Sensor',
+                            sensor_type='bme280', enabled=True)
+            db.session.add(sensor)
+            for temperature in (1.0, 2.0, 3.0):
+                db.session.add(SensorReading(
+                    sensor_id=sensor.id,
+                    sensor_type=sensor.sensor_type,
+                    temperature=temperature,
+                    data={}
+                ))
+            db.session.commit()
+            
+            seen = []
+            url = f'/data?sensor={sensor.id}'
+            with patch('sensor_hub.routes.DATA_VIEW_PAGE_SIZE', 1):
+                for _ in range(5):
+                    body = client.get(url).get_data(as_text=True)
+                    seen.extend(t for t in ('1.0', '2.0', '3.0')
+                                if f'{t}°C' in body)
+                    if 'href="/data?' not in body:
+                        break
+                    cursor = body.split('href="/data?', 1)[1].split('"', 1)[0]
+                    url = '/data?' + cursor.replace('&amp;', '&')
+            
+            assert seen == ['3.0', '2.0', '1.0']
+
     def test_api_to_database_consistency(self, app, client, api_headers):
         """Test API operations maintain database consistency."""
         with app.app_context():
@@ -91,6 +91,19 @@ class TestReadingsAPI:
         assert len(data['readings']) == 1
         assert data['readings'][0]['id'] == reading.id
 
+    def test_get_sensor_readings_matches_to_dict(self, client, api_headers,
+                                                 create_test_sensor,
+                                                 create_test_reading):
+        """Test row-level serialization matches SensorReading.to_dict()."""
+        sensor = create_test_sensor()
+        reading = create_test_reading({'sensor_id': sensor.id})
+        
+        response = client.get(f'/api/sensors/{sensor.id}/readings',
+                             headers=api_headers)
+        data = assert_api_response_success(response)
+        
+        assert data['readings'] == [reading.to_dict()]
+
     def test_get_sensor_readings_with_parameters(self, client, api_headers,
                                                 create_test_sensor,
                                                 test_db_session):
@@ -133,6 +146,22 @@ class TestReadingsAPI:
         
         assert len(data['readings']) <= 10
 
+    def test_get_sensor_readings_query_error(self, client, api_headers,
+                                             create_test_sensor, test_db_session):
+        """Test that a failing readings query returns a 500 error body."""
+        from sensor_hub.models import SensorReading
+        sensor = create_test_sensor()
+        bind = test_db_session.get_bind()
+        SensorReading.__table__.drop(bind)
+        try:
+            response = client.get(f'/api/sensors/{sensor.id}/readings',
+                                 headers=api_headers)
+        finally:
+            SensorReading.__table__.create(bind)
+        
+        assert response.status_code == 500
+        assert_api_response_error(response, 500)
+
     def test_get_all_readings(self, client, api_headers, create_test_sensor,
                              create_test_reading):
         """Test getting all readings from all sensors."""
@@ -212,6 +241,59 @@ class TestStatusAPI:
         assert 'status' in data
         assert 'timestamp' in data
 
+    def test_system_status_refreshed_after_new_reading(self, client,
+                                                       api_headers):
+        """Test posting a reading invalidates the cached status."""
+        response = client.get('/api/status', headers=api_headers)
+        before = assert_api_response_success(response)['recent_readings']
+        
+        reading_data = {
+            'sensor_id': 'test_sensor',
+            'sensor_type': 'bme280',
+            'data': {'temperature': 22.5}
+        }
+        response = client.post('/api/readings',
+                              data=json.dumps(reading_data),
+                              headers=api_headers)
+        assert_api_response_success(response, 201)
+        
+        response = client.get('/api/status', headers=api_headers)
+        data = assert_api_response_success(response)
+        assert data['recent_readings'] == before + 1
+
+    def test_system_stats_refreshed_after_core_sensor_update(
+            self, client, api_headers, create_test_sensor, test_db_session):
+        """Test a Core UPDATE of the sensors table invalidates the cached
+        sensor list."""
+        from sqlalchemy import update
+        from sensor_hub.models import Sensor
+        sensor = create_test_sensor({'status': 'unknown'})
+        
+        response = client.get('/api/system/stats', headers=api_headers)
+        before = response.get_json()['active_sensors']
+        
+        sensors = Sensor.__table__
+        test_db_session.execute(
+            update(sensors).where(sensors.c.id == sensor.id)
+            .values(status='active'))
+        test_db_session.commit()
+        
+        response = client.get('/api/system/stats', headers=api_headers)
+        assert response.get_json()['active_sensors'] == before + 1
+
+    def test_system_status_not_modified(self, client, api_headers):
+        """Test a matching If-None-Match gets an empty 304."""
+        response = client.get('/api/status', headers=api_headers)
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        
+        response = client.get('/api/status', headers={
+            **api_headers, 'If-None-Match': etag
+        })
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+
 
 @pytest.mark.unit
 @pytest.mark.api
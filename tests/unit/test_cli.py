@@ -0,0 +1,77 @@
+"""Unit tests for CLI helpers."""
+
+import pytest
+from collections import Counter
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from sqlalchemy.exc import OperationalError
+
+from sensor_hub import db
+from sensor_hub.cli import _flush_scheduler_batch
+from sensor_hub.models import Sensor, SensorReading
+
+
+@pytest.fixture
+def scheduler_sensor(app):
+    """A committed sensor, removed again after the test."""
+    sensor = Sensor(id='scheduler_sensor', name='Scheduler Sensor',
+                    sensor_type='bme280', status='unknown', error_count=0)
+    db.session.add(sensor)
+    db.session.commit()
+    
+    yield sensor
+    
+    db.session.rollback()
+    SensorReading.query.filter_by(sensor_id=sensor.id).delete()
+    Sensor.query.filter_by(id=sensor.id).delete()
+    db.session.commit()
+
+
+@pytest.mark.unit
+class TestFlushSchedulerBatch:
+    """Test the scheduler's batched commit."""
+
+    def test_failed_commit_keeps_batch(self, scheduler_sensor):
+        """Test that a failed commit keeps readings, error counts and
+        status changes for the next flush."""
+        now = datetime.now(timezone.utc)
+        pending_readings = [(scheduler_sensor.id, 'bme280', now,
+                             21.0, None, None, None, None, {})]
+        error_deltas = Counter({scheduler_sensor.id: 2})
+        scheduler_sensor.status = 'error'
+        
+        failure = OperationalError('COMMIT', {}, Exception('database is locked'))
+        with patch.object(db.session, 'commit', side_effect=failure):
+            with pytest.raises(OperationalError):
+                _flush_scheduler_batch(pending_readings, error_deltas)
+        
+        assert len(pending_readings) == 1
+        assert error_deltas == {scheduler_sensor.id: 2}
+        assert scheduler_sensor.status == 'error'
+        
+        _flush_scheduler_batch(pending_readings, error_deltas)
+        
+        assert pending_readings == []
+        assert not error_deltas
+        db.session.expire_all()
+        sensor = db.session.get(Sensor, scheduler_sensor.id)
+        assert sensor.status == 'error'
+        assert sensor.error_count == 2
+        assert SensorReading.query.filter_by(sensor_id=sensor.id).count() == 1
+    
+    def test_failed_commit_keeps_error_increments(self, scheduler_sensor):
+        """Test that error counts from a failed commit add up with later
+        failures instead of being lost."""
+        error_deltas = Counter({scheduler_sensor.id: 1})
+        
+        failure = OperationalError('COMMIT', {}, Exception('database is locked'))
+        with patch.object(db.session, 'commit', side_effect=failure):
+            with pytest.raises(OperationalError):
+                _flush_scheduler_batch([], error_deltas)
+        
+        error_deltas[scheduler_sensor.id] += 1
+        _flush_scheduler_batch([], error_deltas)
+        
+        db.session.expire_all()
+        assert db.session.get(Sensor, scheduler_sensor.id).error_count == 2
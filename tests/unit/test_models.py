@@ -1,10 +1,14 @@
 """Unit tests for database models."""
 
+import json
 import pytest
 from datetime import datetime, timezone, timedelta
 from unittest.mock import patch
 
+from sqlalchemy import select
+
 from sensor_hub.models import Sensor, SensorReading
+from sensor_hub.serialization import dumps
 from ..conftest import (
     assert_sensor_data_equal, 
     assert_reading_data_valid,
@@ -97,6 +101,40 @@ class TestSensorModel:
         assert latest is not None
         assert latest.id == reading2.id  # Should be the most recent
 
+    def test_latest_per_sensor(self, create_test_sensor, create_test_reading):
+        """Test latest_per_sensor returns each sensor's newest reading."""
+        sensor1 = create_test_sensor()
+        sensor2 = create_test_sensor()
+        now = datetime.now(timezone.utc)
+        
+        create_test_reading({'sensor_id': sensor1.id,
+                             'timestamp': now - timedelta(hours=2)})
+        newest1 = create_test_reading({'sensor_id': sensor1.id,
+                                       'timestamp': now - timedelta(hours=1)})
+        newest2 = create_test_reading({'sensor_id': sensor2.id,
+                                       'timestamp': now - timedelta(hours=3)})
+        
+        latest = SensorReading.latest_per_sensor()
+        assert latest[sensor1.id].id == newest1.id
+        assert latest[sensor2.id].id == newest2.id
+        
+        partial = SensorReading.latest_per_sensor(SensorReading.data)
+        assert partial[sensor1.id].id == newest1.id
+        assert partial[sensor2.id].data == newest2.data
+
+    def test_status_counts(self, create_test_sensor):
+        """Test status_counts aggregates sensors by status."""
+        before = Sensor.status_counts()
+        
+        create_test_sensor({'status': 'active'})
+        create_test_sensor({'status': 'active'})
+        create_test_sensor({'status': 'error'})
+        
+        counts = Sensor.status_counts()
+        assert counts['active'] - before.get('active', 0) == 2
+        assert counts['error'] - before.get('error', 0) == 1
+        assert sum(counts.values()) - sum(before.values()) == 3
+
     def test_sensor_unique_constraint(self, test_db_session):
         """Test that sensor IDs must be unique."""
         import time
@@ -156,6 +194,26 @@ class TestSensorReadingModel:
         assert 'timestamp' in reading_dict
         assert 'id' in reading_dict
 
+    def test_reading_iter_dicts_matches_to_dict(self, create_test_reading):
+        """Test iter_dicts yields the same shape as to_dict."""
+        reading = create_test_reading()
+        query = select(*SensorReading.dict_columns()).where(
+            SensorReading.id == reading.id
+        )
+        
+        assert list(SensorReading.iter_dicts(query)) == [reading.to_dict()]
+
+    def test_reading_iter_dicts_raw_timestamps(self, create_test_reading):
+        """Test iter_dicts without isoformat serializes like to_dict."""
+        reading = create_test_reading()
+        query = select(*SensorReading.dict_columns()).where(
+            SensorReading.id == reading.id
+        )
+        
+        raw = list(SensorReading.iter_dicts(query, isoformat=False))
+        assert raw[0]['timestamp'] == reading.timestamp
+        assert json.loads(dumps(raw)) == [reading.to_dict()]
+
     def test_reading_repr(self, create_test_reading):
         """Test reading string representation."""
         reading = create_test_reading()
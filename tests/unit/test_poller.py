@@ -0,0 +1,79 @@
+"""Unit tests for the live sensor poller."""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sensor_hub.poller import LivePoller
+
+
+class FakeDriver:
+    """Driver stand-in counting reads across instances."""
+    reads = 0
+
+    def __init__(self, sensor_id, config):
+        self.sensor_id = sensor_id
+
+    def read(self):
+        FakeDriver.reads += 1
+        if self.sensor_id == 'broken':
+            raise IOError('bus error')
+        return {'data': {'temperature': 21.0}}
+
+
+def make_sensor(sensor_id, sensor_type='fake'):
+    return SimpleNamespace(id=sensor_id, sensor_type=sensor_type,
+                           i2c_address=0x77, calibration_data=None,
+                           bus_number=1)
+
+
+@pytest.fixture
+def fake_registry():
+    """Resolve the 'fake' sensor type to FakeDriver."""
+    FakeDriver.reads = 0
+    classes = {'fake': FakeDriver}
+    with patch('sensor_hub.poller.sensor_registry') as registry:
+        registry.get_sensor_class.side_effect = classes.get
+        yield registry
+
+
+@pytest.mark.unit
+class TestLivePoller:
+    """Test the LivePoller class."""
+
+    def test_reads_every_call_without_interval(self, fake_registry):
+        """Test that an interval of 0 reads sensors in each call."""
+        poller = LivePoller(interval=0)
+        sensors = [make_sensor('a'), make_sensor('b')]
+
+        first = poller.readings(sensors)
+        second = poller.readings(sensors)
+
+        assert set(first) == {'a', 'b'}
+        assert second['a'] == {'data': {'temperature': 21.0}}
+        assert FakeDriver.reads == 4
+
+    def test_reuses_polled_results(self, fake_registry):
+        """Test that later calls return the polled result without reading."""
+        poller = LivePoller(interval=60)
+        sensors = [make_sensor('a')]
+
+        try:
+            poller.readings(sensors)
+            readings = poller.readings(sensors)
+        finally:
+            poller.stop()
+
+        assert readings['a'] == {'data': {'temperature': 21.0}}
+        assert FakeDriver.reads == 1
+
+    def test_failed_read_and_missing_driver(self, fake_registry):
+        """Test that failed reads are returned as exceptions and sensors
+        without a driver are left out."""
+        poller = LivePoller(interval=0)
+        sensors = [make_sensor('broken'), make_sensor('c', 'unknown')]
+
+        readings = poller.readings(sensors)
+
+        assert isinstance(readings['broken'], IOError)
+        assert 'c' not in readings